@@ -6,6 +6,8 @@ V2
 import numpy as np
 import matplotlib.pyplot as plt
 import typing
+import math
+from decimal import Decimal
 from spinmob._data import fitter
 from scipy.optimize import curve_fit as cf
 from scipy.stats import poisson, norm
@@ -17,6 +19,8 @@ def set_font_size(general_size,legend_size):
     
 
 class UFloat():
+    __slots__ = ('_value', '_error')
+
     def __init__(self, value: float, error: float) -> tuple:
         """
         Creates a UFloat value. This UFloat will contain the value and its uncertainty.
@@ -30,6 +34,26 @@ class UFloat():
 
     @staticmethod
     def first_digit(value: float) -> int:
+        """
+        Gives the number of decimals needed to reach the first significant digit of a value, 0 if the value isn't between 0 and 1.
+
+        Args:
+            value (float): Value to check
+
+        Returns:
+            int: Position of the first significant digit after the decimal point
+        """
+        if not 0 < value < 1:
+            return 0
+        if value < 1e-30:
+            return UFloat._first_digit_text(value) #Rounding to 60 decimals can carry over to the previous digit for those.
+        exponent = math.log10(value)
+        if exponent - math.floor(exponent) < 1e-9 or math.ceil(exponent) - exponent < 1e-9:
+            return -Decimal(float(value)).adjusted() #log10 can round to the wrong side of a power of 10.
+        return -math.floor(exponent)
+
+    @staticmethod
+    def _first_digit_text(value: float) -> int:
         item = list(f"{value:.60f}")
         to_remove = 0
         final_digit = 0
@@ -67,6 +91,8 @@ class UFloat():
 
     #Mathematical functions
     def __add__(self, other):
+        if isinstance(other, UArray):
+            return NotImplemented
         if type(other) != UFloat:
             other_value = other
             other_error = 0
@@ -81,6 +107,8 @@ class UFloat():
         return UFloat.__add__(self, other)
 
     def __sub__(self, other):
+        if isinstance(other, UArray):
+            return NotImplemented
         if type(other) != UFloat:
             other_value = other
             other_error = 0
@@ -95,6 +123,8 @@ class UFloat():
         return UFloat.__sub__(self, other)*-1
 
     def __mul__(self, other):
+        if isinstance(other, UArray):
+            return NotImplemented
         if type(other) != UFloat:
             other_value = other
             other_error = 0
@@ -111,6 +141,8 @@ class UFloat():
         return UFloat.__mul__(self, other)
 
     def __pow__(self, other):
+        if isinstance(other, UArray):
+            return NotImplemented
         if type(other) != UFloat:
             other_value = other
             other_error = 0
@@ -124,6 +156,8 @@ class UFloat():
         return UFloat(value, error)
 
     def __truediv__(self, other):
+        if isinstance(other, UArray):
+            return NotImplemented
         if type(other) != UFloat:
             other_value = other
             other_error = 0
@@ -140,6 +174,8 @@ class UFloat():
         return UFloat.__truediv__(self, other)**(-1)
 
     def __mod__(self, other):
+        if isinstance(other, UArray):
+            return NotImplemented
         if type(other) != UFloat:
             other_value = other
             other_error = 0
@@ -263,6 +299,8 @@ class UList(UFloat):
         return string
 
     def __add__(self, other):
+        if isinstance(other, UArray):
+            return NotImplemented
         total = []
         if type(other) == UList:
             if len(other) == len(self):
@@ -297,6 +335,8 @@ class UList(UFloat):
         return self
 
     def __sub__(self, other):
+        if isinstance(other, UArray):
+            return NotImplemented
         total = []
         if type(other) == UList:
             if len(other) == len(self):
@@ -333,6 +373,8 @@ class UList(UFloat):
         return self
     
     def __mul__(self, other):
+        if isinstance(other, UArray):
+            return NotImplemented
         total = []
         if type(other) == UList:
             if len(other) == len(self):
@@ -367,6 +409,8 @@ class UList(UFloat):
         return self
 
     def __truediv__(self, other):
+        if isinstance(other, UArray):
+            return NotImplemented
         total = []
         if type(other) == UList:
             if len(other) == len(self):
@@ -401,6 +445,8 @@ class UList(UFloat):
         return self
 
     def __pow__(self, other):
+        if isinstance(other, UArray):
+            return NotImplemented
         total = []
         if type(other) == UList:
             if len(other) == len(self):
@@ -432,6 +478,8 @@ class UList(UFloat):
         return self
 
     def __mod__(self, other):
+        if isinstance(other, UArray):
+            return NotImplemented
         total = []
         if type(other) == UList:
             if len(other) == len(self):
@@ -560,6 +608,9 @@ class UList(UFloat):
     def get_data(self):
         return self.get_values(), self.get_errors()  
 
+    def to_array(self):
+        return UArray(values=self.get_values(), errors=self.get_errors())
+
     def to_latex(self, table_label: str, rows: int, columns: int, headers_position: str, table_headers: list, table_caption: str):
         final_str = "\\begin{table}\n\\begin{tabular}"
         format_ = "{" + (columns-1)*"c|" + "c}"
@@ -584,6 +635,170 @@ class UList(UFloat):
         return final_str+format_+mid_str+end_str
 
 
+class UArray():
+    def __init__(self, **kwargs):
+        """
+        Creates a `UArray`, an array of values and uncertainties stored in two NumPy arrays. The arithmetic follows the same propagation rules as `UFloat`, but on the whole arrays at once. The `kwargs` are the same as for `UList`: `values` containing the values of your data, `errors` containing the errors of your data (as a single float or as a list of floats) and `ufloats` containing the data already formatted into `UFloat`.
+        """
+        self.keys = ['values','errors','ufloats']
+        for key in kwargs:
+            if key not in self.keys:
+                raise KeyError(f"You cannot use '{key}' to initialize a UArray.")
+        values = []
+        errors = []
+        if 'values' in kwargs.keys() and 'errors' in kwargs.keys():
+            values = np.asarray(kwargs.get('values'), dtype=float).ravel()
+            errors = np.asarray(kwargs.get('errors'), dtype=float)
+            if errors.ndim > 1 or (errors.ndim == 1 and len(errors) != len(values)):
+                raise ValueError(f"The length of the errors, {errors.size}, doesn't match the length of the values, {len(values)}.")
+            errors = np.broadcast_to(errors, values.shape)
+
+        elif 'values' in kwargs.keys() and 'errors' not in kwargs.keys():
+            raise Exception("You cannot initialize a UArray with values but without errors.")
+
+        if 'ufloats' in kwargs.keys():
+            ufloats = kwargs.get('ufloats')
+            if isinstance(ufloats, UList):
+                ufloats = ufloats.list
+            if type(ufloats) == UFloat:
+                ufloats = [ufloats]
+            ufloats = [item for item in ufloats if type(item) == UFloat]
+            values = np.concatenate([values, [item._value for item in ufloats]])
+            errors = np.concatenate([errors, [item._error for item in ufloats]])
+
+        self.values = np.asarray(values, dtype=float)
+        self.errors = np.abs(np.asarray(errors, dtype=float))
+
+    __array_ufunc__ = None #NumPy arrays on the left give the operation back to the UArray.
+
+    @classmethod
+    def from_arrays(cls, values: np.ndarray, errors: np.ndarray):
+        """
+        Creates a `UArray` directly from arrays of values and errors, without copying them when possible.
+        """
+        new = cls.__new__(cls)
+        new.keys = ['values','errors','ufloats']
+        new.values = np.asarray(values, dtype=float)
+        new.errors = np.abs(np.asarray(errors, dtype=float))
+        return new
+
+    @staticmethod
+    def split(other) -> typing.Tuple[np.ndarray, np.ndarray]:
+        """
+        Gives the values and errors of the other operand. Numbers, lists and arrays have no error.
+        """
+        if isinstance(other, UArray):
+            return other.values, other.errors
+        if isinstance(other, UList):
+            return np.asarray(other.get_values(), dtype=float), np.asarray(other.get_errors(), dtype=float)
+        if isinstance(other, UFloat):
+            return other._value, other._error
+        return np.asarray(other, dtype=float), 0
+
+    def __len__(self):
+        return len(self.values)
+
+    def __getitem__(self, item):
+        if np.ndim(self.values[item]) == 0:
+            return UFloat(self.values[item], self.errors[item])
+        return UArray.from_arrays(self.values[item], self.errors[item])
+
+    def __iter__(self):
+        for value, error in zip(self.values.tolist(), self.errors.tolist()):
+            yield UFloat(value, error)
+
+    def __str__(self):
+        return ", ".join(str(ufloat) for ufloat in self)
+
+    #Mathematical functions
+    def __add__(self, other):
+        other_value, other_error = UArray.split(other)
+        return UArray.from_arrays(self.values + other_value, np.sqrt(self.errors**2 + other_error**2))
+
+    def __radd__(self, other):
+        return UArray.__add__(self, other)
+
+    def __sub__(self, other):
+        other_value, other_error = UArray.split(other)
+        return UArray.from_arrays(self.values - other_value, np.sqrt(self.errors**2 + other_error**2))
+
+    def __rsub__(self, other):
+        return UArray.__sub__(self, other)*-1
+
+    def __mul__(self, other):
+        other_value, other_error = UArray.split(other)
+        value = self.values * other_value
+        with np.errstate(divide='ignore', invalid='ignore'):
+            error = value*np.sqrt((self.errors/self.values)**2+(other_error/other_value)**2)
+        return UArray.from_arrays(value, error)
+
+    def __rmul__(self, other):
+        return UArray.__mul__(self, other)
+
+    def __pow__(self, other):
+        other_value, other_error = UArray.split(other)
+        value = self.values ** other_value
+        with np.errstate(divide='ignore', invalid='ignore'):
+            error = (self.errors/self.values)*other_value*value
+        return UArray.from_arrays(value, error)
+
+    def __truediv__(self, other):
+        other_value, other_error = UArray.split(other)
+        with np.errstate(divide='ignore', invalid='ignore'):
+            value = self.values / other_value
+            error = value*np.sqrt((self.errors/self.values)**2+(other_error/other_value)**2)
+        return UArray.from_arrays(value, error)
+
+    def __rtruediv__(self, other):
+        return UArray.__truediv__(self, other)**(-1)
+
+    def __mod__(self, other):
+        other_value, other_error = UArray.split(other)
+        value = self.values % other_value
+        error = np.sqrt(((self.values+self.errors)%other_value - value)**2 + (self.values%(other_value+other_error))**2)
+        return UArray.from_arrays(value, error)
+
+    def __neg__(self):
+        return UArray.from_arrays(-self.values, self.errors)
+
+    #Comparison functions, on the values like UFloat
+    def __lt__(self, other):
+        return self.values < UArray.split(other)[0]
+
+    def __le__(self, other):
+        return self.values <= UArray.split(other)[0]
+
+    def __gt__(self, other):
+        return self.values > UArray.split(other)[0]
+
+    def __ge__(self, other):
+        return self.values >= UArray.split(other)[0]
+
+    #Other functions
+    def evalf(self, func: callable):
+        value = func(self.values)
+        error = np.abs(func(self.values+self.errors) - value)
+        return UArray.from_arrays(value, error)
+
+    def sum(self) -> UFloat:
+        return UFloat(np.sum(self.values), np.sqrt(np.sum(self.errors**2)))
+
+    def copy(self):
+        return UArray.from_arrays(self.values.copy(), self.errors.copy())
+
+    def get_values(self) -> np.ndarray:
+        return self.values
+
+    def get_errors(self) -> np.ndarray:
+        return self.errors
+
+    def get_data(self) -> typing.Tuple[np.ndarray, np.ndarray]:
+        return self.get_values(), self.get_errors()
+
+    def to_list(self) -> UList:
+        return UList(ufloats=list(self))
+
+
 # Ulist = list[UFloat]
 
 def get_lists(list_: UList) -> typing.Tuple[list[float],list[float]]:
@@ -625,7 +840,38 @@ def standard_dev(list_: UList, mean: UFloat) -> UFloat:
 
     return (sum/(len(list_)-1)).evalf(np.sqrt)
 
+def propagate_curve(call: callable, x, parameters, covariance) -> typing.Tuple[np.ndarray, np.ndarray]:
+    """
+    Evaluates a model over a whole grid at once and propagates the covariance of its parameters with a finite difference Jacobian.
+
+    Args:
+        call (callable): Model, called as `call(x, *parameters)` with NumPy arrays
+        x (np.ndarray): Points where the model is evaluated
+        parameters (np.ndarray): Values of the parameters
+        covariance (np.ndarray): Covariance matrix of the parameters
+
+    Returns:
+        typing.Tuple[np.ndarray, np.ndarray]: Values of the model and their uncertainties.
+    """
+    x = np.asarray(x, dtype=float)
+    parameters = np.asarray(parameters, dtype=float)
+    values = np.broadcast_to(np.asarray(call(x, *parameters), dtype=float), x.shape)
+
+    jacobian = np.empty((len(parameters),) + x.shape)
+    for index, parameter in enumerate(parameters):
+        step = np.cbrt(np.finfo(float).eps)*max(abs(parameter), 1.0)
+        above = parameters.copy()
+        below = parameters.copy()
+        above[index] += step
+        below[index] -= step
+        jacobian[index] = (np.asarray(call(x, *above), dtype=float) - np.asarray(call(x, *below), dtype=float))/(2*step)
+
+    variance = np.einsum('i...,ij,j...->...', jacobian, np.asarray(covariance, dtype=float), jacobian)
+    return values, np.sqrt(np.clip(variance, 0, None))
+
 class UPlot():
+    vectorised_fit = True
+
     def __init__(self, subplots=None, mosaic=False,share_x=False,share_y=False):
         self.lines = {}
         self.lines_number = {}
@@ -686,6 +932,17 @@ class UPlot():
                 line_res.set(**kwargs)
                 line_res.set(linestyle='None')
     
+    @staticmethod
+    def fit_covariance(fitter_obj) -> np.ndarray:
+        """
+        Gives the covariance matrix of the fit parameters, or only their variances if the fit didn't give one.
+        """
+        covariance = getattr(fitter_obj.results, 'covar', None)
+        if covariance is not None:
+            return np.asarray(covariance, dtype=float)
+        errors = [item.stderr if item.stderr is not None else 0 for item in fitter_obj.get_fit_parameters()]
+        return np.diag(np.square(errors))
+
     def fit(self, line_name: str, fit_name: str, function: str, call: callable, parameters: str, plot=False, plot_res=False, subplot=None, subplot_res=None, **func_kwargs):
         xdata, ydata = self.lines_data.get(line_name)
         fitter_obj = fitter()
@@ -701,11 +958,17 @@ class UPlot():
 
         fit_params = fitter_obj.get_fit_parameters()
         ufloat_params = [UFloat(item.value,item.stderr) for item in fit_params]
-        y_range = [call(i, *ufloat_params) for i in x_range]
-        # print(y_range)
-        # ys = [item for item in y_range]
-        # print(ys)
-        y_values, error = get_lists(y_range)
+        vectorised = self.vectorised_fit
+        if vectorised:
+            param_values = [item.value for item in fit_params]
+            covariance = self.fit_covariance(fitter_obj)
+            try:
+                y_values, error = propagate_curve(call, x_range, param_values, covariance)
+            except Exception:
+                vectorised = False #The model only works with UFloat parameters.
+        if not vectorised:
+            y_range = [call(i, *ufloat_params) for i in x_range]
+            y_values, error = get_lists(y_range)
         if subplot is not None:
             str_params = ""
             str_params_name = parameters.split(',')
@@ -722,7 +985,14 @@ class UPlot():
             # self.axs.legend()
 
         if plot_res:
-            residuals = UList(ufloats=[UFloat(y[index],y_err[index]) - call(UFloat(value,x_err[index]),*ufloat_params) for index, value in enumerate(x)])
+            if vectorised:
+                x_array = np.asarray(x, dtype=float)
+                model, model_error = propagate_curve(call, x_array, param_values, covariance)
+                step = np.cbrt(np.finfo(float).eps)*np.maximum(np.abs(x_array), 1.0)
+                slope = (np.asarray(call(x_array+step, *param_values), dtype=float) - np.asarray(call(x_array-step, *param_values), dtype=float))/(2*step)
+                residuals = UArray.from_arrays(np.asarray(y, dtype=float) - model, np.sqrt(np.square(y_err) + model_error**2 + (slope*np.asarray(x_err, dtype=float))**2))
+            else:
+                residuals = UList(ufloats=[UFloat(y[index],y_err[index]) - call(UFloat(value,x_err[index]),*ufloat_params) for index, value in enumerate(x)])
             if subplot_res is not None:
                 res_values = residuals.get_values()
                 res_errors = residuals.get_errors()
@@ -3,6 +3,9 @@ from PyQt5 import QtCore, QtWidgets, QtGui
 from PyQt5.QtWidgets import QWidget
 from spinmob.egg import gui as g #type: ignore
 import datetime, os, superqt
+import concurrent.futures, threading
+import collections, shutil, tempfile, uuid, weakref
+import numpy as np
 import read_root
 from playsound import playsound
 
@@ -87,26 +90,220 @@ class Seperator(QtWidgets.QWidget):
         layout.addWidget(right_grid)
 
 class CheckFiles(QtCore.QObject):
+    """Checks which files contain data on a pool of threads. The result of each file is sent through `progress` as soon as it is known."""
     finished = QtCore.pyqtSignal()
     progress = QtCore.pyqtSignal(list)
     gen_path = []
     files = []
     tree = ""
+    max_workers = None
+
+    def __init__(self):
+        super(CheckFiles, self).__init__()
+        self._cancel_event = threading.Event()
+
+    @property
+    def cancelled(self) -> bool:
+        return self._cancel_event.is_set()
+
+    def cancel(self):
+        """Stops the scan, the files that weren't checked yet are skipped. Can be called from any thread."""
+        self._cancel_event.set()
+
+    def check(self, key, file) -> list:
+        if self.cancelled:
+            return
+        path = os.path.join(*self.gen_path, file)
+        root = read_root.root_reader_v2(path, self.tree)
+        return [int(key),root.has_data()] #Only reads the TTree's metadata, the size of the file doesn't matter.
 
     def start(self):
-        for index, (key, file) in enumerate(self.files):
-            path = os.path.join(*self.gen_path, file)
-            root = read_root.root_reader_v2(path, self.tree)
-            if os.stat(path).st_size/(1024*1024) >= 20:
-                self.progress.emit([int(key),True])
-                continue
-            data = root.open()
-            if data is None:
-                self.progress.emit([int(key),False])
-                continue
-            self.progress.emit([int(key),True])
+        with concurrent.futures.ThreadPoolExecutor(max_workers=self.max_workers) as executor:
+            futures = [executor.submit(self.check, key, file) for key, file in self.files]
+            for future in concurrent.futures.as_completed(futures):
+                if self.cancelled:
+                    executor.shutdown(wait=False, cancel_futures=True)
+                    break
+                self.progress.emit(future.result())
         self.finished.emit()
             
+class PlotJobs(QtCore.QObject):
+    """Runs the histogram computations on a pool of threads so that the GUI stays responsive.
+
+    The result of each job is given to its callback on the GUI thread. The exceptions raised by the jobs are sent through `failed` and the number of jobs left through `running`.
+    """
+    failed = QtCore.pyqtSignal(object)
+    running = QtCore.pyqtSignal(int)
+    _done = QtCore.pyqtSignal(int, object, object)
+    max_workers = None
+
+    def __init__(self):
+        super(PlotJobs, self).__init__()
+        self._executor = concurrent.futures.ThreadPoolExecutor(max_workers=self.max_workers)
+        self._callbacks: dict[int, typing.Callable] = {}
+        self._futures: dict[int, concurrent.futures.Future] = {}
+        self._next_job = 0
+        self._done.connect(self._deliver)
+
+    def submit(self, function: typing.Callable, callback: typing.Callable, *args, **kwargs) -> int:
+        """Runs `function(*args, **kwargs)` on the pool and gives its result to `callback` once it's done.
+
+        Parameters
+        ----------
+        function : typing.Callable
+            Computation to run
+        callback : typing.Callable
+            Function called on the GUI thread with the result
+
+        Returns
+        -------
+        job : int
+            Identifier of the job, used to cancel it
+        """
+        job = self._next_job
+        self._next_job += 1
+        self._callbacks[job] = callback
+        self._futures[job] = self._executor.submit(self._run, job, function, args, kwargs)
+        self.running.emit(len(self._callbacks))
+        return job
+
+    def cancel(self, job: int = None):
+        """Cancels a job, or all of them if none is given. The jobs that already started are left to finish but their results are dropped."""
+        jobs = list(self._callbacks) if job is None else [job]
+        for job in jobs:
+            self._callbacks.pop(job, None)
+            future = self._futures.pop(job, None)
+            if future is not None:
+                future.cancel()
+        self.running.emit(len(self._callbacks))
+
+    def _run(self, job: int, function: typing.Callable, args: tuple, kwargs: dict):
+        try:
+            result, error = function(*args, **kwargs), None
+        except Exception as exception:
+            result, error = None, exception
+        self._done.emit(job, result, error) #Queued to the GUI thread.
+
+    def _deliver(self, job: int, result, error):
+        callback = self._callbacks.pop(job, None)
+        self._futures.pop(job, None)
+        if callback is None:
+            return #Cancelled
+        self.running.emit(len(self._callbacks))
+        if error is not None:
+            self.failed.emit(error)
+            return
+        callback(result)
+
+class LineStore:
+    """Raw data of the plotted lines with a memory budget. Used like a dictionary (line name to data).
+
+    The data of the oldest lines is moved to memory mapped files once the arrays kept in memory go over the budget. If `spill` is turned off (or the data can't be written), the data is dropped instead and only the histograms of the lines are left.
+
+    Parameters
+    ----------
+    max_bytes : int, optional
+        Memory budget of the arrays kept in memory in bytes, by default `None` which uses `default_max_bytes`
+    """
+    default_max_bytes = 1024**3
+    spill = True
+
+    def __init__(self, max_bytes: int = None):
+        self.max_bytes = self.default_max_bytes if max_bytes is None else max_bytes
+        self._items: collections.OrderedDict[str, np.ndarray | tuple[np.ndarray, ...] | None] = collections.OrderedDict()
+        self._files: dict[str, list[str]] = {}
+        self._directory = None
+
+    @staticmethod
+    def _arrays(value) -> list[np.ndarray]:
+        if value is None:
+            return []
+        return list(value) if isinstance(value, tuple) else [value]
+
+    @staticmethod
+    def _to_array(data) -> np.ndarray:
+        return data if isinstance(data, np.memmap) else np.asarray(data) #Spilled data stays on the disk.
+
+    def _nbytes(self, value) -> int:
+        return sum(array.nbytes for array in self._arrays(value) if not isinstance(array, np.memmap))
+
+    @property
+    def nbytes(self) -> int:
+        """Memory used by the arrays kept in memory."""
+        return sum(self._nbytes(value) for value in self._items.values())
+
+    def __setitem__(self, name: str, value):
+        if name in self._items:
+            self.pop(name)
+        if isinstance(value, tuple):
+            value = tuple(self._to_array(array) for array in value)
+        elif value is not None:
+            value = self._to_array(value)
+        self._items[name] = value
+        self.evict()
+
+    def __getitem__(self, name: str):
+        return self._items[name]
+
+    def __contains__(self, name: str) -> bool:
+        return name in self._items
+
+    def __len__(self) -> int:
+        return len(self._items)
+
+    def keys(self):
+        return self._items.keys()
+
+    def pop(self, name: str, default=None):
+        """Removes the data of a line and returns it. The memory mapped files are deleted when possible."""
+        value = self._items.pop(name, default)
+        for file in self._files.pop(name, []):
+            try:
+                os.remove(file)
+            except OSError:
+                pass #Still mapped (on Windows), removed with the directory.
+        return value
+
+    def clear(self):
+        """Removes the data of all the lines and their files."""
+        self._items.clear()
+        self._files.clear()
+        if self._directory is not None:
+            self._finalizer()
+            self._directory = None
+
+    def evict(self):
+        """Spills (or drops) the data of the oldest lines until the arrays kept in memory fit in the budget."""
+        for name in list(self._items):
+            if self.nbytes <= self.max_bytes:
+                return
+            value = self._items[name]
+            if self._nbytes(value) == 0:
+                continue
+            self._items[name] = self._spill(name, value) if self.spill else None
+
+    def _spill(self, name: str, value):
+        if self._directory is None:
+            self._directory = tempfile.mkdtemp(prefix="ReadROOT-")
+            self._finalizer = weakref.finalize(self, shutil.rmtree, self._directory, True)
+
+        arrays = []
+        try:
+            for array in self._arrays(value):
+                if isinstance(array, np.memmap):
+                    arrays.append(array)
+                    continue
+                file = os.path.join(self._directory, f"{uuid.uuid4().hex}.npy")
+                self._files.setdefault(name, []).append(file)
+                mapped = np.lib.format.open_memmap(file, mode="w+", dtype=array.dtype, shape=array.shape)
+                mapped[...] = array
+                mapped.flush()
+                del mapped
+                arrays.append(np.load(file, mmap_mode="r"))
+        except OSError:
+            return #Couldn't write the data, only the histogram is left.
+        return tuple(arrays) if isinstance(value, tuple) else arrays[0]
+
 class SelectionBox(QtCore.QObject):
     on_save = QtCore.pyqtSignal(str)
     def __init__(self, default_text: str = None):
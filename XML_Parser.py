@@ -19,9 +19,52 @@ class XMLParser:
         self.reformatted_keys = ['polarity', 'baseline', 'coincidence', 'start', 'ebins', 'input_range', 'cfd', 'discriminator', 'coarse_gain', 'trig_out']
         self.formatted = 0
         self.board_formatted = False
+        self._root = None
+        self._board_entries = None
+        self._board_parameters = None
+        self._key_groups = None
+        self._channel_values = None
+        self._channel_labels = None
+        self._channel_table = None
+
+    @property
+    def root(self) -> ET.Element:
+        """Root of the settings file, which is parsed only once."""
+        if self._root is None:
+            self._root = ET.parse(self.file).getroot()
+        return self._root
+
+    def _index(self):
+        """Indexes the board parameters by key and the values of each channel by key, so the lookups don't go through the XML tree again."""
+        if self._channel_values is not None:
+            return
+        root = self.root
+        self._board_entries = []
+        self._key_groups = {}
+        for entry in root.find('board/parameters'):
+            key = entry.find('key').text
+            group = entry.find('value/descriptor/group').text
+            self._board_entries.append((key, entry.find('value/value').text, group))
+            self._key_groups[key] = group
+
+        self._channel_values = []
+        self._channel_labels = []
+        for channel in root.findall('board/channel'):
+            values = {}
+            label = "CH"
+            for entry in channel.findall('values/entry'):
+                key = entry.find('key').text
+                value = entry.find('value')
+                if value is None:
+                    continue
+                if key == "SW_PARAMETER_CH_LABEL" and key not in values:
+                    label = value.text #The first label given is the one used.
+                values[key] = value.text
+            self._channel_values.append(values)
+            self._channel_labels.append((channel.find('index').text, label))
 
     def get_board_properties(self):
-        root = ET.parse(self.file).getroot()
+        root = self.root
         name = root.find('board/label').text
         id = root.find('board/id').text
         model = root.find('board/modelName').text
@@ -125,80 +168,56 @@ class XMLParser:
     
     def get_parameters(self):
         """
-        Gets the board parameters (shared parameters for all channels).
+        Gets the board parameters (shared parameters for all channels). They are formatted once and copied afterwards.
         """
-        root = ET.parse(self.file).getroot()
-        board_parameters = root.find('board/parameters')
-        for entry in board_parameters:
-            key = entry.find('key').text
-            value = entry.find('value/value').text
-            group = entry.find('value/descriptor/group').text
-            
-            if value == 'true':
-                value = True
-            if value == 'false':
-                value = False
-                
-            for tab in self.groups:
-                if group == tab:
-                    #if units is None:
-                    self.parameters[tab][key] = value
-                    #else:
-                        #self.parameters[tab][key] = [value, units]
-        self.formatted = 0
-        self.reformat(['all'])
-        
+        if self._board_parameters is None:
+            self._index()
+            self.parameters = {group:{} for group in self.groups}
+            for key, value, group in self._board_entries:
+                if value == 'true':
+                    value = True
+                if value == 'false':
+                    value = False
+
+                if group in self.parameters:
+                    self.parameters[group][key] = value
+            self.formatted = 0
+            self.reformat(['all'])
+            self._board_parameters = self.parameters
+
+        self.parameters = {group:dict(values) for group, values in self._board_parameters.items()}
         return self.parameters
 
+    def get_parameter_table(self):
+        """
+        Gets the parameters of every channel at once. The table is built in one pass over the channels, each channel getting the board parameters overwritten by its own values.
+
+        Returns:
+            dict: Parameters of each channel (grouped like `get_parameters`) by channel number. The table is shared, copy a channel before modifying it.
+        """
+        if self._channel_table is None:
+            board_parameters = self.get_parameters()
+            self._channel_table = {}
+            for chn_number, values in enumerate(self._channel_values):
+                parameters = {group:dict(group_values) for group, group_values in board_parameters.items()}
+                for key, value in values.items():
+                    group = self._key_groups.get(key)
+                    if group not in parameters or key not in parameters[group]:
+                        continue
+                    if value is not None and ('true' in value or 'false' in value):
+                        continue #The booleans are kept from the board parameters.
+                    parameters[group][key] = value
+                self._channel_table[chn_number] = parameters
+        return self._channel_table
+
     def get_chn_parameters(self, chn_number: str):
-        root = ET.parse(self.file).getroot()
-        channels = root.findall('board/channel')
-        channel_in_use = channels[chn_number]
-        # keys = channel_in_use.findall('values/entry/key')
-        # values = channel_in_use.findall('values/entry/value')
-        entries = channel_in_use.findall('values/entry')
-        entries_with_vals = []
-        for index, entry in enumerate(entries):
-            if entry.find('value') is not None:
-                entries_with_vals.append(entries[index])
-
-        keys = []
-        values = []
-        for entry in entries_with_vals:
-            keys.append(entry.find('key'))
-            values.append(entry.find('value'))
-
-        list_format = []
-        for key in keys:
-            if key.text in self.reformatted:
-                list_format.append(self.reformatted_keys[self.reformatted.index(key.text)])
-        
-        for group in self.parameters:
-            for index, key in enumerate(keys):
-                if key.text in self.parameters[group]:
-                    if 'true' in values[index].text or 'false' in values[index].text:
-                        values[index].text = (True if values[index].text == 'true' else False)
-                    else:
-                        self.parameters[group][key.text] = values[index].text
-        
-        # self.formatted = 0
-        # self.reformat(list_format)
+        channel_parameters = self.get_parameter_table()[chn_number]
+        self.parameters = {group:dict(values) for group, values in channel_parameters.items()}
         return self.parameters
 
     def get_ch_label(self, chn_number: str):
-        root = ET.parse(self.file).getroot()
-        channels = root.findall('board/channel')
-        channel_to_check = channels[chn_number]
-        index = channel_to_check.find('index').text
-        entries = channel_to_check.findall('values/entry')
-        for entry in entries:
-            if entry.find('key').text == "SW_PARAMETER_CH_LABEL":
-                if entry.find('value') is not None:
-                    label = entry.find('value').text
-                    break
-        else: # I'm a genius. Don't mind me using disgusting functions in python.
-            label = "CH" #This is executed if the loop ends normally (so without encountering the break above.)
-        return (index, label)
+        self._index()
+        return self._channel_labels[chn_number]
 
 
 class InfoParser:
@@ -1,26 +1,22 @@
-import os, sys, matplotlib, json, difflib #type: ignore
-running_directory = os.getcwd() #This is to make the relative import work!
+import os, sys, json, difflib, importlib #type: ignore
 path = os.path.dirname(os.path.abspath(__file__))
-os.chdir(path)
 sys.path.append(path) #FOR C++ TO WORK!
 
 __version__ = '2.5.12'
 
-from . import read_root
-from . import read_root_gui
-from . import read_root_gui_v2
-from . import IOClasses
-from . import QtClasses
-from . import root_plotter
-
-reader = read_root._root_reader
-reader_v2 = read_root.root_reader_v2
-gui = read_root_gui.GUI
-guiv2 = read_root_gui_v2.GUIv2
-fileexp = IOClasses.FileExplorer
-config = IOClasses.Configuration
-setup = IOClasses.SetUpCpp
-plotter = root_plotter.RootPlotter
+#The submodules are only imported when they are first used, so that scripts that only read files don't load the GUI stack.
+_submodules = ["read_root", "read_root_gui", "read_root_gui_v2", "IOClasses", "QtClasses", "root_plotter", "merge", "batch", "ErrorPropagation", "XML_Parser"]
+_gui_submodules = ["read_root_gui", "read_root_gui_v2", "root_plotter"]
+_aliases = {
+    "reader" : ("read_root", "_root_reader"),
+    "reader_v2" : ("read_root", "root_reader_v2"),
+    "gui" : ("read_root_gui", "GUI"),
+    "guiv2" : ("read_root_gui_v2", "GUIv2"),
+    "fileexp" : ("IOClasses", "FileExplorer"),
+    "config" : ("IOClasses", "Configuration"),
+    "setup" : ("IOClasses", "SetUpCpp"),
+    "plotter" : ("root_plotter", "RootPlotter")
+}
 
 #Make the colormaps:
 white_turbo_list = [
@@ -51,19 +47,46 @@ black_turbo_list = [
     (1, '#311542')
 ]
 
-white_turbo = matplotlib.colors.LinearSegmentedColormap.from_list('white_turbo', white_turbo_list, N=256)
-black_turbo = matplotlib.colors.LinearSegmentedColormap.from_list('black_turbo', black_turbo_list, N=256)
-matplotlib.colormaps.register(white_turbo)
-matplotlib.colormaps.register(black_turbo)
-
-from colorama import init
-from termcolor import cprint
-from ValidInputs import ValidInputs
+def register_colormaps():
+    """Registers the white and black turbo colormaps in matplotlib, once. The GUIs need them to be registered.
+    """
+    global white_turbo, black_turbo
+    if "white_turbo" in globals():
+        return
+    import matplotlib #type: ignore
+    white_turbo = matplotlib.colors.LinearSegmentedColormap.from_list('white_turbo', white_turbo_list, N=256)
+    black_turbo = matplotlib.colors.LinearSegmentedColormap.from_list('black_turbo', black_turbo_list, N=256)
+    for colormap in [white_turbo, black_turbo]:
+        if colormap.name not in matplotlib.colormaps:
+            matplotlib.colormaps.register(colormap)
+
+def __getattr__(name: str):
+    if name in ["white_turbo", "black_turbo"]:
+        register_colormaps()
+        return globals()[name]
+    if name in _submodules:
+        if name in _gui_submodules:
+            register_colormaps()
+        return importlib.import_module(f".{name}", __name__) #Also sets the attribute on the package.
+    if name in _aliases:
+        module_name, attribute = _aliases[name]
+        value = getattr(__getattr__(module_name), attribute)
+        globals()[name] = value
+        return value
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+
+def __dir__():
+    return sorted(set(globals()) | set(_submodules) | set(_aliases) | {"white_turbo", "black_turbo"})
 
 
 def do_config():
     """Reloads the C++ header files.
     """
+    from colorama import init
+    from termcolor import cprint
+    from ValidInputs import ValidInputs
+    from .IOClasses import Configuration as config, SetUpCpp as setup
+    running_directory = os.getcwd()
     os.chdir(path)
     init()
     with open("config.json", "r") as f:
@@ -112,12 +135,16 @@ def add_config(name: str):
     name : str
         Name of the new configuration
     """
+    from .IOClasses import Configuration as config
+    running_directory = os.getcwd()
     os.chdir(path)
     new_configuration = config(name, "config.json")
     new_configuration.find_required_headers(autosave=True)
     os.chdir(running_directory)
 
 def delete_config(name: str):
+    from termcolor import cprint
+    running_directory = os.getcwd()
     os.chdir(path)
     with open("config.json", "r") as f:
         data = json.load(f)
@@ -127,10 +154,8 @@ def delete_config(name: str):
         json.dump(data, f, indent=4)
     os.chdir(running_directory)
 
-with open("config.json", "r") as f:
+with open(os.path.join(path, "config.json"), "r") as f:
     info = json.load(f)
 
 if info.get("LoadConfig"):
-    do_config()
-
-os.chdir(running_directory)
\ No newline at end of file
+    do_config()
\ No newline at end of file
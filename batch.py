@@ -0,0 +1,239 @@
+"""
+Headless processing of CoMPASS runs: `python -m ReadROOT.batch RUN [RUN ...]`.
+
+Every `.root` file found in the RAW, UNFILTERED and FILTERED folders of the runs gets its energy, PSD, time and MCS histograms computed on a pool of processes. The TOF and Energy vs Energy histograms of all the channel pairs given with `--tof` are computed together for each folder. The histograms are saved in `.npz` files in the `BATCH` folder of the run, or in `--output`.
+"""
+import argparse, concurrent.futures, os, re, sys
+import numpy
+from . import read_root
+
+tree_names = {"RAW": "Data_R", "UNFILTERED": "Data", "FILTERED": "Data_F"}
+histogram_names = ["energy", "psd", "time", "mcs"]
+channel_pattern = re.compile(r"CH(\d+)@")
+
+def find_channel_files(folder: str) -> dict[int, str]:
+    """Finds the `.root` file of each channel in a CoMPASS folder, using the `CH<number>@` part of the file names.
+
+    Parameters
+    ----------
+    folder : str
+        Path to the RAW, UNFILTERED or FILTERED folder of a run
+
+    Returns
+    -------
+    files : dict[int, str]
+        Path of the file of each channel
+    """
+    files = {}
+    if not os.path.isdir(folder):
+        return files
+    for file in sorted(os.listdir(folder)):
+        match = channel_pattern.search(file)
+        if file.endswith(".root") and match is not None:
+            files[int(match.group(1))] = os.path.join(folder, file)
+    return files
+
+def find_jobs(runs: list[str], root_types: list[str], tof_pairs: list[tuple[int, int]], output: str = None) -> list[tuple]:
+    """Lists the files to process for every run.
+
+    Parameters
+    ----------
+    runs : list[str]
+        Paths to the run folders
+    root_types : list[str]
+        Folders to process in each run (RAW, UNFILTERED and/or FILTERED)
+    tof_pairs : list[tuple[int, int]]
+        Start and stop channels of the TOF histograms
+    output : str, optional
+        Folder where the results are saved, by default `None` which saves them in the `BATCH` folder of each run
+
+    Returns
+    -------
+    jobs : list[tuple]
+        Kind of job ("channel" or "tof"), input files, TTree key, output path and TOF pairs of each job
+    """
+    jobs = []
+    for run in runs:
+        run = os.path.abspath(run)
+        output_folder = os.path.join(run, "BATCH") if output is None else os.path.join(os.path.abspath(output), os.path.basename(run))
+        for root_type in root_types:
+            files = find_channel_files(os.path.join(run, root_type))
+            tree = tree_names[root_type]
+            for channel, file in files.items():
+                jobs.append(("channel", (file,), tree, os.path.join(output_folder, f"{root_type}_CH{channel}.npz"), ()))
+            pairs = tuple((start, stop) for start, stop in tof_pairs if start in files and stop in files)
+            if pairs:
+                channels = sorted({channel for pair in pairs for channel in pair})
+                jobs.append(("tof", tuple(files[channel] for channel in channels), tree, os.path.join(output_folder, f"{root_type}_TOF.npz"), pairs))
+    return jobs
+
+def is_up_to_date(job: tuple) -> bool:
+    """Checks if the output of a job is newer than all of its input files."""
+    _, files, _, output_path, _ = job
+    if not os.path.exists(output_path):
+        return False
+    output_time = os.path.getmtime(output_path)
+    return all(os.path.getmtime(file) <= output_time for file in files)
+
+def channel_histograms(file_path: str, tree: str, settings: dict) -> tuple[dict[str, numpy.ndarray], list[str]]:
+    """Computes the histograms of one channel. Each histogram is computed on its own, so that one that can't be computed (like the MCS graph of a run shorter than one second) doesn't lose the others.
+
+    Parameters
+    ----------
+    file_path : str
+        Path to the root file
+    tree : str
+        Key for the TTree inside the root file
+    settings : dict
+        Options given to the command line (see `parse_arguments`)
+
+    Returns
+    -------
+    output_tuple : tuple[dict[str, numpy.ndarray], list[str]]
+        Bin edges (or x data for the MCS graph) and counts of each histogram, and the reason each skipped histogram couldn't be computed.
+    """
+    reader = read_root.root_reader_v2(file_path, tree, settings["step_size"])
+    histograms = {
+        "energy": (lambda: reader.get_energy_hist(settings["bins"]), "energy_edges", "energy_counts"),
+        "psd": (lambda: reader.get_psd_hist(settings["bins"]), "psd_edges", "psd_counts"),
+        "time": (lambda: reader.get_time_hist(*settings["time_range"], settings["bins"]), "time_edges", "time_counts"),
+        "mcs": (reader.get_mcs_graph, "mcs_x", "mcs_counts")
+    }
+    arrays = {}
+    skipped = []
+    for name in histogram_names:
+        if name not in settings["histograms"]:
+            continue
+        compute, x_name, y_name = histograms[name]
+        try:
+            arrays[x_name], arrays[y_name], _ = compute()
+        except Exception as exception:
+            skipped.append(f"{name}: {exception}")
+    if len(arrays) == 0:
+        raise ValueError("; ".join(skipped))
+    return arrays, skipped
+
+def tof_histograms(files: tuple[str, ...], tree: str, pairs: tuple[tuple[int, int], ...], settings: dict) -> dict[str, numpy.ndarray]:
+    """Computes the TOF and Energy vs Energy histograms of the pairs of channels. The FILTERED files already have coinciding events, the others go through the `CoincidenceBuilder` which reads every file once for all the pairs.
+
+    Parameters
+    ----------
+    files : tuple[str, ...]
+        Paths to the root files of the channels used by the pairs
+    tree : str
+        Key for the TTree inside the root files
+    pairs : tuple[tuple[int, int], ...]
+        Start and stop channels of each pair
+    settings : dict
+        Options given to the command line (see `parse_arguments`)
+
+    Returns
+    -------
+    arrays : dict[str, numpy.ndarray]
+        Bin edges and counts of the histograms, named `CH<start>_CH<stop>_<name>`
+    """
+    channel_files = {int(channel_pattern.search(os.path.basename(file)).group(1)):file for file in files}
+    if tree == tree_names["FILTERED"]:
+        arrays = {}
+        for start, stop in pairs:
+            reader = read_root.root_reader_v2(channel_files[start], tree, settings["step_size"])
+            tof = reader.get_tof_hist(channel_files[stop], *settings["tof_range"], settings["tof_bins"])
+            evse = reader.get_evse_hist(channel_files[stop], settings["bins"], settings["bins"])
+            if tof is None or evse is None:
+                raise ValueError(f"CH{start} and CH{stop} don't have the same number of events.")
+            arrays[f"CH{start}_CH{stop}_tof_edges"], arrays[f"CH{start}_CH{stop}_tof_counts"] = tof[0], tof[1]
+            arrays[f"CH{start}_CH{stop}_evse_xedges"], arrays[f"CH{start}_CH{stop}_evse_yedges"], arrays[f"CH{start}_CH{stop}_evse_counts"] = evse[0], evse[1], evse[2]
+        return arrays
+
+    from .merge.merge_root_files import CoincidenceBuilder #Needs PyQt5, only loaded for the merged TOF.
+    coincidences = CoincidenceBuilder(channel_files, settings["window"], tree).build(pairs)
+    histograms = CoincidenceBuilder.histograms(coincidences, *settings["tof_range"], settings["tof_bins"], settings["bins"])
+    return {f"CH{start}_CH{stop}_{name}":array for (start, stop), pair_histograms in histograms.items() for name, array in pair_histograms.items()}
+
+def run_job(job: tuple, settings: dict) -> tuple[str, list[str]]:
+    """Computes the histograms of a job and saves them. This runs in the worker processes.
+
+    Parameters
+    ----------
+    job : tuple
+        Job given by `find_jobs`
+    settings : dict
+        Options given to the command line (see `parse_arguments`)
+
+    Returns
+    -------
+    output_tuple : tuple[str, list[str]]
+        Path of the saved `.npz` file and the histograms that were skipped, with the reason.
+    """
+    kind, files, tree, output_path, pairs = job
+    read_root.root_reader_v2.decompression_workers = read_root.root_reader_v2.interpretation_workers = settings["threads"]
+    read_root.root_reader_v2.use_sidecar = settings["sidecar"]
+    try:
+        arrays, skipped = channel_histograms(files[0], tree, settings) if kind == "channel" else (tof_histograms(files, tree, pairs, settings), [])
+    finally:
+        read_root.dataset_cache.clear() #Each file is only used by one job.
+    os.makedirs(os.path.dirname(output_path), exist_ok=True)
+    temporary_path = output_path + ".part.npz"
+    (numpy.savez_compressed if settings["compress"] else numpy.savez)(temporary_path, **arrays)
+    os.replace(temporary_path, output_path) #A stopped batch never leaves a partial file behind.
+    return output_path, skipped
+
+def parse_arguments(argv: list[str] = None) -> argparse.Namespace:
+    parser = argparse.ArgumentParser(prog="python -m ReadROOT.batch", description="Computes the histograms of CoMPASS runs without the GUI.")
+    parser.add_argument("runs", nargs="+", help="Run folders containing the RAW, UNFILTERED and/or FILTERED folders")
+    parser.add_argument("-o", "--output", default=None, help="Folder where the results are saved, by default the BATCH folder of each run")
+    parser.add_argument("-t", "--types", nargs="+", choices=list(tree_names), default=list(tree_names), help="Folders to process")
+    parser.add_argument("--histograms", nargs="+", choices=histogram_names, default=histogram_names, help="Histograms computed for every channel")
+    parser.add_argument("--bins", type=int, default=4096, help="Number of bins of the energy, PSD and time histograms, and of each axis of the Energy vs Energy histograms")
+    parser.add_argument("--time-range", type=float, nargs=2, default=(0, 100), metavar=("MIN", "MAX"), help="Range of the time histogram")
+    parser.add_argument("--tof", type=int, nargs=2, action="append", default=[], metavar=("START", "STOP"), help="Start and stop channels of a TOF histogram, can be repeated")
+    parser.add_argument("--tof-bins", type=int, default=8192, help="Number of bins of the TOF histograms")
+    parser.add_argument("--tof-range", type=float, nargs=2, default=(-100, 100), metavar=("MIN", "MAX"), help="Range of the TOF histograms (ns)")
+    parser.add_argument("--window", type=int, default=100000, help="Coincidence window (ps) used to merge the RAW and UNFILTERED files")
+    parser.add_argument("--step-size", default=None, help="Streams the files in batches of this size (entries or a size like '100 MB')")
+    parser.add_argument("-j", "--workers", type=int, default=None, help="Number of processes, by default the number of processors")
+    parser.add_argument("--threads", type=int, default=1, help="Threads decompressing the files in each process, 1 by default since every process already reads its own files")
+    parser.add_argument("--sidecar", action="store_true", help="Keeps an uncompressed copy of the branches next to the files, so that the next batches don't decompress them again")
+    parser.add_argument("--overwrite", action="store_true", help="Recomputes the results that are newer than their files")
+    parser.add_argument("--no-compress", dest="compress", action="store_false", help="Saves the .npz files without compression")
+    arguments = parser.parse_args(argv)
+    if arguments.step_size is not None and arguments.step_size.isdigit():
+        arguments.step_size = int(arguments.step_size)
+    return arguments
+
+def main(argv: list[str] = None) -> int:
+    arguments = parse_arguments(argv)
+    settings = {key: getattr(arguments, key) for key in ["histograms", "bins", "time_range", "tof_bins", "tof_range", "window", "step_size", "threads", "sidecar", "compress"]}
+    jobs = find_jobs(arguments.runs, arguments.types, [tuple(pair) for pair in arguments.tof], arguments.output)
+    if not arguments.overwrite:
+        skipped = []
+        outdated = []
+        for job in jobs:
+            if is_up_to_date(job):
+                skipped.append(job)
+            else:
+                outdated.append(job)
+        jobs = outdated
+        if skipped:
+            print(f"Skipping {len(skipped)} up to date result(s).")
+    if len(jobs) == 0:
+        print("Nothing to do.")
+        return 0
+
+    failed = 0
+    with concurrent.futures.ProcessPoolExecutor(max_workers=arguments.workers) as executor:
+        futures = {executor.submit(run_job, job, settings): job for job in jobs}
+        for done, future in enumerate(concurrent.futures.as_completed(futures), 1):
+            job = futures[future]
+            try:
+                output_path, skipped = future.result()
+                print(f"[{done}/{len(jobs)}] {output_path}")
+                for reason in skipped:
+                    print(f"[{done}/{len(jobs)}] Skipped {reason}", file=sys.stderr)
+            except Exception as exception:
+                failed += 1
+                print(f"[{done}/{len(jobs)}] Failed {', '.join(job[1])}: {exception}", file=sys.stderr)
+    return 1 if failed else 0
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -120,8 +120,6 @@ std::pair<std::vector<int64_t>, std::vector<int64_t>> process(
         const std::vector<int64_t> & starts, 
         const std::vector<int64_t> & stops, 
         int64_t upper_bound) {
-    const std::size_t starts_size = starts.size();
-    std::cout << "Processing slice: " << starts_size << std::endl;
     std::vector<int64_t> res_starts; // (starts_size);
     std::vector<int64_t> res_stops; // (starts_size);
 
@@ -134,7 +132,6 @@ std::pair<std::vector<int64_t>, std::vector<int64_t>> process(
             }
         }
     }
-    std::cout << res_starts.size() << std::endl;
     // for(int64_t d:res_starts) {
     //     std::cout << "qaz:" << d << std::endl;
     // }
@@ -146,7 +143,40 @@ std::pair<std::vector<int64_t>, std::vector<int64_t>> process(
 
  
 
-std::tuple<py::array_t<int64_t>, py::array_t<int64_t>> TOF(py::array_t<int64_t> array_start, py::array_t<int64_t> array_stop, int64_t upper_bound){
+#define SORTED_TOF 1
+#if SORTED_TOF
+/**Processes the starts [begin, end) against the sorted stops with a two-pointer scan.
+ * The stop pointer of the slice is placed with a binary search, so the slices only share the stops they overlap on and nothing is copied.*/
+std::pair<std::vector<int64_t>, std::vector<int64_t>> process_sorted(
+        const int64_t * starts,
+        std::size_t begin,
+        std::size_t end,
+        const int64_t * stops,
+        std::size_t stops_size,
+        int64_t upper_bound) {
+    std::vector<int64_t> res_starts;
+    std::vector<int64_t> res_stops;
+    res_starts.reserve(end - begin);
+    res_stops.reserve(end - begin);
+
+    const int64_t * stops_end = stops + stops_size;
+    const int64_t * stop_it = std::lower_bound(stops, stops_end, starts[begin] - upper_bound);
+
+    for (std::size_t i = begin; i < end; i++) {
+        const int64_t start_time = starts[i];
+        while (stop_it != stops_end && *stop_it < start_time - upper_bound) {
+            ++stop_it;
+        }
+        if (stop_it != stops_end && *stop_it <= start_time + upper_bound) {
+            res_starts.push_back(start_time);
+            res_stops.push_back(*stop_it);
+        }
+    }
+    return {res_starts, res_stops};
+}
+#endif
+
+std::tuple<py::array_t<int64_t>, py::array_t<int64_t>> TOF_unsorted(py::array_t<int64_t> array_start, py::array_t<int64_t> array_stop, int64_t upper_bound){
 #if MEASURE
     auto tstart = std::chrono::steady_clock::now();
 #endif
@@ -223,10 +253,53 @@ std::tuple<py::array_t<int64_t>, py::array_t<int64_t>> TOF(py::array_t<int64_t>
 
 
 
+std::tuple<py::array_t<int64_t>, py::array_t<int64_t>> TOF(py::array_t<int64_t, py::array::c_style | py::array::forcecast> array_start, py::array_t<int64_t, py::array::c_style | py::array::forcecast> array_stop, int64_t upper_bound){
+#if SORTED_TOF
+    const int64_t * starts = array_start.data();
+    const int64_t * stops = array_stop.data();
+    const std::size_t starts_size = array_start.size();
+    const std::size_t stops_size = array_stop.size();
+
+    //The CoMPASS timestamps are monotonic, anything else goes through the old brute force search.
+    if (!std::is_sorted(starts, starts + starts_size) || !std::is_sorted(stops, stops + stops_size)) {
+        return TOF_unsorted(array_start, array_stop, upper_bound);
+    }
+
+    std::vector<int64_t> start;
+    std::vector<int64_t> stop;
+    if (starts_size == 0 || stops_size == 0) {
+        return {VEC_TO_ARRAY(start), VEC_TO_ARRAY(stop)};
+    }
+
+    {
+        py::gil_scoped_release release; //The slices only read the buffers, Python can keep going meanwhile.
+
+        const std::size_t cpu_count = std::max<std::size_t>(1, std::thread::hardware_concurrency());
+        const std::size_t slice_size = std::max<std::size_t>(1, (starts_size + cpu_count - 1) / cpu_count);
+
+        std::vector<std::future<std::pair<std::vector<int64_t>, std::vector<int64_t>>>> futures;
+        for (std::size_t i = 0; i < starts_size; i += slice_size) {
+            futures.push_back(std::async(std::launch::async, process_sorted, starts, i, std::min(i + slice_size, starts_size), stops, stops_size, upper_bound));
+        }
+        start.reserve(starts_size);
+        stop.reserve(starts_size);
+        for (auto & f: futures) {
+            auto p = f.get();
+            start.insert(start.end(), p.first.begin(), p.first.end());
+            stop.insert(stop.end(), p.second.begin(), p.second.end());
+        }
+    }
+
+    return {VEC_TO_ARRAY(start), VEC_TO_ARRAY(stop)};
+#else
+    return TOF_unsorted(array_start, array_stop, upper_bound);
+#endif
+}
+
 // std::tuple<py::array_t<int64_t>, py::array_t<unsigned long long>> test(py::array_t<int64_t> test_array){
 //     std::vector<int64_t> index = get_indexes(ARRAY_TO_VEC(test_array), 2.0, 3.0);
     
 //     auto index_array = VEC_TO_ARRAY(index);
 
 //     return {test_array, index_array};
-// }
\ No newline at end of file
+// }
@@ -34,8 +34,8 @@ py::array_t<unsigned long long> VEC_TO_ARRAY(std::vector<unsigned long long> vec
 // Mathematical functions on vectors
 std::vector<int64_t> substract_abs(const std::vector<int64_t> & vec, int64_t value);
 
-// This function runs the TOF analysis on all cores of the machine.
-std::tuple<py::array_t<int64_t>, py::array_t<int64_t>> TOF(py::array_t<int64_t> array_start, py::array_t<int64_t> array_stop, int64_t window);
+// This function runs the TOF analysis on all cores of the machine. Sorted timestamps are scanned in linear time, the others fall back to the brute force search.
+std::tuple<py::array_t<int64_t>, py::array_t<int64_t>> TOF(py::array_t<int64_t, py::array::c_style | py::array::forcecast> array_start, py::array_t<int64_t, py::array::c_style | py::array::forcecast> array_stop, int64_t window);
 
 // Test function for the wrapper
 // std::tuple<py::array_t<int64_t>, py::array_t<unsigned long long>> test(py::array_t<int64_t> test_array);
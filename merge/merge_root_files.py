@@ -2,7 +2,6 @@
 import uproot
 import numpy as np
 import pandas as pd
-import rich.progress
 
 from dataclasses import dataclass
 from pathlib import Path
@@ -21,6 +20,90 @@ def uint64_diff(a: U64, b: U64) -> tuple[U64, int]:
         return b - a, -1
     
 #Throughout the rest of the code 0 is considered to be the stop and 1 the start. This means that doing t0-t1 is doing stop-start like normal.
+
+def find_coincidences(timestamps0: np.ndarray, timestamps1: np.ndarray, window: U64) -> tuple[np.ndarray, np.ndarray]:
+    """Finds the one-to-one coincidences between two sorted arrays of timestamps.
+
+    Each start is matched with the first unused stop within ±window, exactly like walking both arrays in order and dropping the oldest timestamp when they don't coincide. The stop candidates of every start are found at once with `np.searchsorted`. Only the starts whose windows share stops with the previous start need to be resolved one after the other.
+
+    Parameters
+    ----------
+    timestamps0 : np.ndarray
+        Sorted stop timestamps
+    timestamps1 : np.ndarray
+        Sorted start timestamps
+    window : U64
+        Maximum time for the events to coincide
+
+    Returns
+    -------
+    indexes : tuple[np.ndarray, np.ndarray]
+        Indexes of the coinciding stops and starts.
+    """
+    timestamps0 = np.asarray(timestamps0, dtype=np.uint64)
+    timestamps1 = np.asarray(timestamps1, dtype=np.uint64)
+    window = np.uint64(window)
+
+    lower = np.where(timestamps1 > window, timestamps1 - window, 0).astype(np.uint64) #Avoids the wrap around of the unsigned timestamps.
+    first = np.searchsorted(timestamps0, lower, side="left") #First stop that is not too early for each start.
+    last = np.searchsorted(timestamps0, timestamps1 + window, side="right") #One past the last stop that is not too late.
+
+    #A start can only lose its first candidate to the previous start if their candidates overlap.
+    contested = np.zeros(len(timestamps1), dtype=bool)
+    if len(timestamps1) > 1:
+        overlap = last[:-1] > first[1:]
+        contested[1:] |= overlap
+        contested[:-1] |= overlap
+
+    matched = (first < last) & ~contested
+    index0 = [first[matched]]
+    index1 = [np.flatnonzero(matched)]
+
+    contested_indexes = np.flatnonzero(contested)
+    if len(contested_indexes) != 0:
+        resolved0 = []
+        resolved1 = []
+        pointer = 0
+        for index, lowest, highest in zip(contested_indexes.tolist(), first[contested_indexes].tolist(), last[contested_indexes].tolist()):
+            pointer = max(pointer, lowest)
+            if pointer < highest:
+                resolved0.append(pointer)
+                resolved1.append(index)
+                pointer += 1
+        index0.append(np.array(resolved0, dtype=np.intp))
+        index1.append(np.array(resolved1, dtype=np.intp))
+
+    index0 = np.concatenate(index0)
+    index1 = np.concatenate(index1)
+    order = np.argsort(index1, kind="stable")
+    return index0[order], index1[order]
+
+def load_events(file_path: Path, tree: str, unfilter_data: bool = False, cuts: list = None) -> tuple[np.ndarray, np.ndarray]:
+    """Reads the timestamps and energies of a channel, keeping only the unfiltered events and the energies inside the cuts if asked.
+
+    Parameters
+    ----------
+    file_path : Path
+        Root file of the channel
+    tree : str
+        TTree key for the root file
+    unfilter_data : bool, optional
+        Whether only the unfiltered events are kept, by default False
+    cuts : list, optional
+        Start and stop of the energy cut, by default None
+
+    Returns
+    -------
+    events : tuple[np.ndarray, np.ndarray]
+        Timestamps and energies of the events.
+    """
+    keys = ["Timestamp", "Energy", "Flags"] if unfilter_data else ["Timestamp", "Energy"]
+    data = reader(file_path, tree).open(raw=True, keys=keys)
+    if unfilter_data:
+        data = read_root.get_unfiltered(data)
+    if cuts:
+        data = data.iloc[read_root.define_cut(*cuts, data["Energy"])]
+    return data["Timestamp"].to_numpy(), data["Energy"].to_numpy()
     
 @dataclass
 class ConsolidatedData:
@@ -46,7 +129,7 @@ class Merger(QtCore.QObject):
     """
     cuts_enabled = False
     unfilter_data = False
-    finished = QtCore.pyqtSignal(list)
+    finished = QtCore.pyqtSignal(object)
 
     def __init__(self, stop_file: Path, start_file: Path, window: U64 = 0, tree: str = "Data_R") -> None:
         super(Merger, self).__init__()
@@ -61,90 +144,168 @@ class Merger(QtCore.QObject):
             self.cuts[file] = [start, stop]
 
     def merge(self) -> None:     
-        root_file0 = reader(self.file_ch0__, self.tree).open(raw=True)
-        root_file1 = reader(self.file_ch1__, self.tree).open(raw=True)
-
-        if self.unfilter_data:
-            unfiltered_root_file0 = read_root.get_unfiltered(root_file0)
-            unfiltered_root_file1 = read_root.get_unfiltered(root_file1)
-        else:
-            unfiltered_root_file0 = root_file0
-            unfiltered_root_file1 = root_file1
-
-        if self.cuts_enabled:
-            filtered_root_file0 = unfiltered_root_file0.iloc[read_root.define_cut(*self.cuts[0],unfiltered_root_file0["Energy"])]
-            filtered_root_file1 = unfiltered_root_file1.iloc[read_root.define_cut(*self.cuts[1],unfiltered_root_file1["Energy"])]
-        else:
-            filtered_root_file0 = unfiltered_root_file0
-            filtered_root_file1 = unfiltered_root_file1       
-    
-        length = len(filtered_root_file0["Energy"])           
-        result: list[ConsolidatedData] = []
-        
-        delta: U64
-        threshold: U64 = self.window
-        iter_t0 = np.nditer(filtered_root_file0["Timestamp"],flags=["f_index"])
-        iter_e0 = np.nditer(filtered_root_file0["Energy"])
-        iter_t1 = np.nditer(filtered_root_file1["Timestamp"])
-        iter_e1 = np.nditer(filtered_root_file1["Energy"])
-       
-        t0 = next(iter_t0)
-        e0 = next(iter_e0)
-        t1 = next(iter_t1) 
-        e1 = next(iter_e1)
-        
-        with rich.progress.Progress(
-            "[progress.percentage]{task.percentage:>3.0f}%",
-            rich.progress.BarColumn(),
-            rich.progress.DownloadColumn(),
-            "•",
-            rich.progress.TimeRemainingColumn(
-                compact=True,
-                elapsed_when_finished=True
-            ),
-            "•",
-            rich.progress.TransferSpeedColumn(),
-            "•",
-            rich.progress.SpinnerColumn(finished_text="✔")
-        ) as progress:
-            task_id = progress.add_task("", total=length)
-            while t0 != 0 and t1 != 0:
-                progress.update(task_id, completed=iter_t0.index)
-                delta, sign = uint64_diff(t0, t1) # Doing t0-t1
-                if delta <= threshold:
-                    result.append(ConsolidatedData(t0, t1, e0, e1))
-                    
-                    t0 = next(iter_t0, 0)
-                    e0 = next(iter_e0, 0)
-                    
-                    t1 = next(iter_t1, 0) 
-                    e1 = next(iter_e1, 0)
-                elif sign < 0:
-                    t0 = next(iter_t0, 0)
-                    e0 = next(iter_e0, 0)
-                elif sign > 0:
-                    t1 = next(iter_t1, 0) 
-                    e1 = next(iter_e1, 0)
-
-            progress.update(task_id, completed=length)
-                    
-        # print("result len:", len(result))
+        timestamps0, energies0 = load_events(self.file_ch0__, self.tree, self.unfilter_data, self.cuts[0] if self.cuts_enabled else None)
+        timestamps1, energies1 = load_events(self.file_ch1__, self.tree, self.unfilter_data, self.cuts[1] if self.cuts_enabled else None)
+        index0, index1 = find_coincidences(timestamps0, timestamps1, self.window)
+
+        result = {
+            "Start Time":timestamps1[index1],
+            "Stop Time":timestamps0[index0],
+            "Start Energy":energies1[index1],
+            "Stop Energy":energies0[index0]
+        }
+
         self.finished.emit(result)
         return result
 
+class CoincidenceBuilder(QtCore.QObject):
+    """Finds the coincidences between all the channels of a board at once.
+    Each channel is read once, however many pairs use it, and each pair is matched with `find_coincidences` on the loaded arrays, so every pair gives exactly the result of `Merger.merge`.
+
+    Parameters
+    ----------
+    files : dict[int, Path]
+        Root file of each channel
+    window : U64, optional
+        Maximum time for the events to coincide, by default 0
+    tree : str, optional
+        TTree key for the root files, by default "Data_R"
+    """
+    cuts_enabled = False
+    unfilter_data = False
+    finished = QtCore.pyqtSignal(object)
+
+    def __init__(self, files: dict[int, Path], window: U64 = 0, tree: str = "Data_R") -> None:
+        super(CoincidenceBuilder, self).__init__()
+        self.files = dict(files)
+        self.window : U64 = window
+        self.tree = tree
+        self.cuts = {channel:[] for channel in self.files}
+
+    def select_cuts(self, start: U16, stop: U16, channel: int):
+        if self.cuts.get(channel) is not None:
+            self.cuts[channel] = [start, stop]
+
+    def build(self, pairs: list[tuple[int, int]] = None) -> dict[tuple[int, int], dict[str, np.ndarray]]:
+        """Finds the coincidences of the pairs of channels.
+
+        Parameters
+        ----------
+        pairs : list[tuple[int, int]], optional
+            Start and stop channels of each pair, by default every pair with the lowest channel as the start
+
+        Returns
+        -------
+        coincidences : dict[tuple[int, int], dict[str, np.ndarray]]
+            Start Time, Stop Time, Start Energy and Stop Energy of each pair, like the result of `Merger.merge`.
+        """
+        channels = sorted(self.files)
+        pairs = [(start, stop) for index, start in enumerate(channels) for stop in channels[index+1:]] if pairs is None else list(pairs)
+        used_channels = sorted({channel for pair in pairs for channel in pair})
+        events = {channel: load_events(self.files[channel], self.tree, self.unfilter_data, self.cuts[channel] if self.cuts_enabled else None) for channel in used_channels}
+
+        coincidences = {}
+        for start, stop in pairs:
+            start_times, start_energies = events[start]
+            stop_times, stop_energies = events[stop]
+            index0, index1 = find_coincidences(stop_times, start_times, self.window)
+            coincidences[(start, stop)] = {
+                "Start Time":start_times[index1],
+                "Stop Time":stop_times[index0],
+                "Start Energy":start_energies[index1],
+                "Stop Energy":stop_energies[index0]
+            }
+
+        self.finished.emit(coincidences)
+        return coincidences
+
+    @staticmethod
+    def histograms(coincidences: dict[tuple[int, int], dict[str, np.ndarray]], min_: float, max_: float, tof_bins: int = 8192, energy_bins: int = 4096) -> dict[tuple[int, int], dict[str, np.ndarray]]:
+        """Computes the TOF and Energy vs Energy histograms of every pair.
+
+        Parameters
+        ----------
+        coincidences : dict[tuple[int, int], dict[str, np.ndarray]]
+            Coincidences returned by `build`
+        min_ : float
+            Minimum time for the TOF bins (ns)
+        max_ : float
+            Maximum time for the TOF bins (ns)
+        tof_bins : int, optional
+            Number of bins of the TOF histograms, by default 8192
+        energy_bins : int, optional
+            Number of bins of each axis of the Energy vs Energy histograms, by default 4096
+
+        Returns
+        -------
+        histograms : dict[tuple[int, int], dict[str, np.ndarray]]
+            Bin edges and counts of the histograms of each pair.
+        """
+        histograms = {}
+        for pair, data in coincidences.items():
+            tof_counts, tof_edges = read_root.histogram(read_root.get_tof_differences(data), tof_bins, (min_, max_))
+            if len(data["Start Energy"]) != 0:
+                evse_counts, evse_xedges, evse_yedges = np.histogram2d(data["Start Energy"], data["Stop Energy"], (energy_bins, energy_bins))
+            else:
+                evse_counts, evse_xedges, evse_yedges = np.zeros((energy_bins, energy_bins)), np.zeros(energy_bins+1), np.zeros(energy_bins+1)
+            histograms[pair] = {"tof_edges":tof_edges, "tof_counts":tof_counts, "evse_xedges":evse_xedges, "evse_yedges":evse_yedges, "evse_counts":evse_counts}
+        return histograms
+
+    @staticmethod
+    def save_histograms(histograms: dict[tuple[int, int], dict[str, np.ndarray]], file_path: str, compress: bool = True) -> str:
+        """Saves the histograms of every pair into one `.npz` file, the arrays of a pair being named `CH<start>_CH<stop>_<name>`.
+
+        Parameters
+        ----------
+        histograms : dict[tuple[int, int], dict[str, np.ndarray]]
+            Histograms returned by `histograms`
+        file_path : str
+            Path to the `.npz` file
+        compress : bool, optional
+            Whether the file is compressed or not, by default True
+
+        Returns
+        -------
+        file_path : str
+            Path of the saved file
+        """
+        arrays = {f"CH{start}_CH{stop}_{name}":array for (start, stop), pair_histograms in histograms.items() for name, array in pair_histograms.items()}
+        (np.savez_compressed if compress else np.savez)(file_path, **arrays)
+        return file_path
+
 class Converter:
     compress = True
-    def __init__(self, data_set: list[ConsolidatedData]):
-        self.data_set: list[ConsolidatedData] = data_set
+    binary = True
+    def __init__(self, data_set: dict[str, np.ndarray] | list[ConsolidatedData]):
+        self.data_set: dict[str, np.ndarray] | list[ConsolidatedData] = data_set
+
+    @staticmethod
+    def output_path(file_path: str) -> str:
+        """Gives the path where `save` writes the data, `.npy` if binary is set to `True` and `.csv` otherwise.
+
+        Parameters
+        ----------
+        file_path : str
+            Path to the file
+
+        Returns
+        -------
+        file_path : str
+            Path with the proper extension
+        """
+        return str(Path(file_path).with_suffix(".npy" if Converter.binary else ".csv"))
 
     def convert(self) -> pd.DataFrame:
-        """Converts a list of ConsolidatedData to a tuple containing the different data types.
+        """Converts the columns returned by the `Merger` (or a list of ConsolidatedData) to a dataframe.
 
         Returns
         -------
         output_tuple : pd.DataFrame
             Start timestamps, stop timestamps, start energies and stop energies of the original list.
         """
+        if isinstance(self.data_set, dict):
+            return pd.DataFrame(self.data_set)
+
         start_time_stamps = [item.timestamp1 for item in self.data_set]
         stop_time_stamps = [item.timestamp0 for item in self.data_set]
         start_energies = [item.energy1 for item in self.data_set]
@@ -152,16 +313,42 @@ class Converter:
         temp_dict = {"Start Time":start_time_stamps,"Stop Time":stop_time_stamps,"Start Energy":start_energies,"Stop Energy":stop_energies}
         return pd.DataFrame.from_dict(temp_dict)
 
-    def save(self, file_path: str):
-        """Saves the data into a csv file compressed with bz2 if compress is set to `True`.
+    def to_records(self) -> np.ndarray:
+        """Converts the data to a structured array with typed columns (see `read_root.tof_data_dtype`).
+
+        Returns
+        -------
+        records : np.ndarray
+            Start timestamps, stop timestamps, start energies and stop energies of the original data.
+        """
+        columns = self.data_set if isinstance(self.data_set, dict) else self.convert()
+        records = np.empty(len(columns["Start Time"]), dtype=read_root.tof_data_dtype)
+        for name in read_root.tof_data_dtype.names:
+            records[name] = columns[name]
+        return records
+
+    def save(self, file_path: str) -> str:
+        """Saves the data into a `.npy` file if binary is set to `True`, which can be memory mapped when loaded with `read_root.load_tof_data`. Otherwise, the data is saved into a csv file compressed with bz2 if compress is set to `True`.
 
         Parameters
         ----------
         file_path : str
-            Path to the file
+            Path to the file, the extension is replaced by the one of the format used.
+
+        Returns
+        -------
+        file_path : str
+            Path of the saved file
         """
+        file_path = Converter.output_path(file_path)
+        read_root.TOFData.forget(file_path)
+        if Converter.binary:
+            np.save(file_path, self.to_records())
+            return file_path
+
         df = self.convert()
         df.to_csv(file_path, index=False, compression="bz2") if Converter.compress else df.to_csv(file_path, index=False)
+        return file_path
 
                 
 if __name__ == '__main__':
@@ -1,5 +1,11 @@
 import numpy
 import sys
+import typing
+import collections
+import threading
+import heapq
+import hashlib
+import json
 import matplotlib.pyplot as _plt #type: ignore
 import uproot as _ur #type: ignore
 import pandas
@@ -9,6 +15,9 @@ import pint
 import os as _os
 
 
+histogram_bincount_span = 1 << 20 #Widest range of integer values counted with `numpy.bincount` by `histogram`.
+tof_data_dtype = numpy.dtype([("Start Time", numpy.uint64), ("Stop Time", numpy.uint64), ("Start Energy", numpy.uint16), ("Stop Energy", numpy.uint16)]) #Columns of the merged TOF data saved in `TOF Data`.
+
 
 def define_cut(start: int, stop: int, data_set: pandas.DataFrame) -> numpy.array:
     """Finds the indexes that are within a given cut
@@ -51,6 +60,197 @@ def get_unfiltered(data: pandas.DataFrame) -> pandas.DataFrame:
     return pandas.DataFrame(temp_dict)    
 
 
+def count_values(values: numpy.array) -> tuple[numpy.array, numpy.array] | None:
+    """Counts each distinct value of integer data with `numpy.bincount`.
+
+    Parameters
+    ----------
+    values : numpy.array
+        Data to count
+
+    Returns
+    -------
+    output_tuple : tuple[numpy.array, numpy.array] | None
+        Distinct values and their counts, `None` if the data isn't made of integers or spans more than `histogram_bincount_span` values.
+    """
+    values = numpy.asarray(values)
+    if values.dtype.kind not in "ui" or values.size == 0:
+        return
+
+    if values.dtype.kind == "u" and values.dtype.itemsize <= 2: #Small enough to count without looking for the minimum first.
+        counts = numpy.bincount(values.ravel())
+        distinct = numpy.flatnonzero(counts)
+        return (distinct, counts[distinct])
+
+    minimum, maximum = values.min(), values.max()
+    if int(maximum) - int(minimum) >= histogram_bincount_span:
+        return
+    offsets = values - minimum if values.dtype.kind == "u" else values.astype(numpy.intp) - int(minimum) #Signed differences can wrap around in the data's dtype.
+    counts = numpy.bincount(offsets.astype(numpy.intp, copy=False).ravel())
+    distinct = numpy.flatnonzero(counts)
+    return (distinct.astype(numpy.int64) + int(minimum), counts[distinct])
+
+
+def rebin_counts(counts: numpy.ndarray, shape: int | tuple[int, ...]) -> numpy.ndarray | None:
+    """Rebins a histogram exactly by summing whole groups of neighbouring bins.
+
+    Parameters
+    ----------
+    counts : numpy.ndarray
+        Counts of the histogram (1D or 2D)
+    shape : int | tuple[int, ...]
+        Number of bins wanted along each axis
+
+    Returns
+    -------
+    rebinned_counts : numpy.ndarray | None
+        Rebinned counts, `None` if the number of bins of an axis isn't a multiple of the wanted number.
+    """
+    shape = (shape,) if isinstance(shape, (int, numpy.integer)) else tuple(shape)
+    if len(shape) != counts.ndim or any(new <= 0 or old % new != 0 for old, new in zip(counts.shape, shape)):
+        return
+    grouped_shape = [size for new, old in zip(shape, counts.shape) for size in (new, old // new)]
+    return counts.reshape(grouped_shape).sum(axis=tuple(range(1, 2 * len(shape), 2)))
+
+
+def histogram(values: numpy.array, bins: int, range_: tuple[float, float] = None) -> tuple[numpy.array, numpy.array]:
+    """Histograms data with regular bins, giving the same counts and edges as `numpy.histogram`.
+
+    Integer data like ADC channels is first counted value by value with `numpy.bincount`, then only the distinct values are binned. The other data types go through the fixed width path of `numpy.histogram` with the range found beforehand.
+
+    Parameters
+    ----------
+    values : numpy.array
+        Data to histogram
+    bins : int
+        Number of bins
+    range_ : tuple[float, float], optional
+        Range of the histogram, by default `None` which uses the minimum and maximum of the data
+
+    Returns
+    -------
+    output_tuple : tuple[numpy.array, numpy.array]
+        Counts and edges of the histogram, in the same order as `numpy.histogram`.
+    """
+    values = numpy.asarray(values)
+    if values.size == 0:
+        return numpy.histogram(values, bins, range=range_)
+
+    counted = count_values(values)
+    if counted is not None:
+        distinct, counts = counted
+        y, x = numpy.histogram(distinct, bins, range=range_, weights=counts)
+        return (y.astype(numpy.intp), x)
+
+    range_ = (values.min(), values.max()) if range_ is None else range_
+    return numpy.histogram(values, bins, range=range_)
+
+
+class FineHistogram:
+    """Histogram kept at a fine resolution so that it can be drawn again with other bins without the raw data.
+
+    Integer data is kept as the counts of its distinct values, which gives the exact histogram for any bins and range. The other data is kept with `fine_factor` times more bins than requested and is rebinned by summing whole groups of fine bins.
+
+    Parameters
+    ----------
+    counts : numpy.array
+        Counts of the fine bins (or of the distinct values)
+    edges : numpy.array
+        Edges of the fine bins, `None` if the distinct values are given
+    values : numpy.array, optional
+        Distinct values counted, by default `None`
+    """
+    fine_factor = 16
+
+    def __init__(self, counts: numpy.array, edges: numpy.array, values: numpy.array = None):
+        self.counts = counts
+        self.edges = edges
+        self.values = values
+
+    @classmethod
+    def from_data(cls, data: numpy.array, bins: int, range_: tuple[float, float] = None) -> "FineHistogram":
+        """Generates the fine histogram of raw data.
+
+        Parameters
+        ----------
+        data : numpy.array
+            Raw data
+        bins : int
+            Number of bins of the histogram that is drawn
+        range_ : tuple[float, float], optional
+            Range of the histogram, by default `None` which uses the minimum and maximum of the data
+
+        Returns
+        -------
+        fine_histogram : FineHistogram
+            Fine histogram of the data
+        """
+        counted = count_values(data)
+        if counted is not None:
+            distinct, counts = counted
+            return cls(counts, None, distinct)
+        counts, edges = histogram(data, bins * cls.fine_factor, range_)
+        return cls(counts, edges)
+
+    def rebin(self, bins: int, range_: tuple[float, float] = None) -> tuple[numpy.array, numpy.array] | None:
+        """Gives the histogram with another number of bins.
+
+        Parameters
+        ----------
+        bins : int
+            Number of bins
+        range_ : tuple[float, float], optional
+            Range of the histogram, by default `None` which uses the whole fine histogram (or the minimum and maximum of the distinct values)
+
+        Returns
+        -------
+        output_tuple : tuple[numpy.array, numpy.array] | None
+            Counts and edges of the histogram, `None` if the range is empty, if it doesn't fall on the fine edges or if the bins can't be made of whole groups of fine bins.
+        """
+        if self.values is not None:
+            y, x = numpy.histogram(self.values, bins, range=range_, weights=self.counts)
+            return (y.astype(numpy.intp), x)
+
+        start, stop = 0, len(self.counts)
+        if range_ is not None:
+            bounds = numpy.searchsorted(self.edges, range_)
+            bounds = [min(max(bound, 0), len(self.edges)-1) for bound in bounds]
+            if not numpy.allclose(self.edges[bounds], range_):
+                return
+            start, stop = bounds
+            if stop <= start:
+                return
+
+        counts = rebin_counts(self.counts[start:stop], bins)
+        if counts is None:
+            return
+        return (counts, self.edges[start:stop+1:(stop-start)//bins])
+
+
+def calculate_psd(energy_long: numpy.array, energy_short: numpy.array, dtype=numpy.float64) -> numpy.array:
+    """Calculates the PSD values of whole arrays of energies. The PSD is set to 0 where the long gate energy is 0.
+
+    Parameters
+    ----------
+    energy_long : numpy.array
+        Long gate energies
+    energy_short : numpy.array
+        Short gate energies
+    dtype : optional
+        Data type of the PSD values, by default `numpy.float64`
+
+    Returns
+    -------
+    psd : numpy.array
+        PSD values
+    """
+    energy_long = numpy.asarray(energy_long, dtype=numpy.float64) #Avoids the wrap around of unsigned energies when the short gate is bigger.
+    energy_short = numpy.asarray(energy_short, dtype=numpy.float64)
+    psd = numpy.zeros(energy_long.shape, dtype=numpy.float64)
+    numpy.divide(energy_long - energy_short, energy_long, out=psd, where=energy_long != 0)
+    return psd.astype(dtype, copy=False)
+
+
 def generate_csv_name(file_path, start: int, stop: int, window: pint.Quantity, cutsOn: bool = None, cuts: tuple = None) -> str:
     """Generates the csv file path where the C++ TOF will save its data.
 
@@ -90,13 +290,143 @@ def generate_csv_name(file_path, start: int, stop: int, window: pint.Quantity, c
 
     return _os.path.join(directory, csv_name)
 
+def _tof_data_path(file_path: str) -> str:
+    """Gives the path of the merged TOF file to read, trying the other extension (`.npy` or `.csv`) if the file doesn't exist."""
+    if not _os.path.exists(file_path):
+        name, extension = _os.path.splitext(file_path)
+        other_path = name + (".csv" if extension == ".npy" else ".npy")
+        if _os.path.exists(other_path):
+            return other_path
+    return file_path
+
+def load_tof_data(file_path: str, compress=True) -> numpy.ndarray | pandas.DataFrame:
+    """Loads the merged TOF data saved by the `Converter`. The `.npy` files are memory mapped and the `.csv` files are read with pandas. If the file doesn't exist, the same name with the other extension is tried.
+
+    Parameters
+    ----------
+    file_path : str
+        Path to the `.npy` or `.csv` file containing the time and energy information
+    compress : bool, optional
+        Whether the `.csv` file is compressed or not, by default True
+
+    Returns
+    -------
+    data : numpy.ndarray | pandas.DataFrame
+        Structured array (or dataframe) with the Start Time, Stop Time, Start Energy and Stop Energy columns.
+    """
+    file_path = _tof_data_path(file_path)
+    if _os.path.splitext(file_path)[1] == ".npy":
+        return numpy.load(file_path, mmap_mode="r")
+    return pandas.read_csv(file_path, compression="bz2") if compress else pandas.read_csv(file_path)
+
+def get_tof_differences(data: numpy.ndarray | pandas.DataFrame) -> numpy.array:
+    """Calculates the time differences (in ns) between the stops and the starts of the merged TOF data.
+
+    Parameters
+    ----------
+    data : numpy.ndarray | pandas.DataFrame
+        Data returned by `load_tof_data`
+
+    Returns
+    -------
+    delta_time : numpy.array
+        Time differences
+    """
+    return (numpy.asarray(data["Stop Time"], dtype=numpy.int64) - numpy.asarray(data["Start Time"], dtype=numpy.int64))*1e-3 #Signed to keep the stops happening before the starts.
+
+
+class TOFData:
+    """Merged TOF data loaded once and used for all the TOF histograms. Use `TOFData.load` to reuse the datasets that were recently loaded.
+
+    Parameters
+    ----------
+    file_path : str
+        Path to the `.npy` or `.csv` file containing the time and energy information
+    compress : bool, optional
+        Whether the `.csv` file is compressed or not, by default True
+    """
+    cache_size = 4
+    _cache: "collections.OrderedDict[tuple[str, int], TOFData]" = collections.OrderedDict()
+    _lock = threading.RLock()
+
+    def __init__(self, file_path: str, compress=True):
+        self.file_path = _tof_data_path(file_path)
+        data = load_tof_data(self.file_path, compress)
+        self.start_energy = numpy.array(data["Start Energy"]) #Copied so that the cached datasets don't keep the `.npy` file mapped, Windows can't overwrite a mapped file.
+        self.stop_energy = numpy.array(data["Stop Energy"])
+        self.delta_time = get_tof_differences(data)
+
+    @classmethod
+    def load(cls, file_path: str, compress=True) -> "TOFData":
+        """Gives the dataset of a merged TOF file, loading it only if it isn't cached or if the file changed since.
+
+        Parameters
+        ----------
+        file_path : str
+            Path to the `.npy` or `.csv` file containing the time and energy information
+        compress : bool, optional
+            Whether the `.csv` file is compressed or not, by default True
+
+        Returns
+        -------
+        dataset : TOFData
+            Loaded dataset
+        """
+        file_path = _os.path.abspath(_tof_data_path(file_path))
+        key = (file_path, _os.stat(file_path).st_mtime_ns)
+        with cls._lock:
+            dataset = cls._cache.get(key)
+            if dataset is not None:
+                cls._cache.move_to_end(key)
+                return dataset
+
+        dataset = cls(file_path, compress)
+        with cls._lock: #The GUI loads the datasets from its plot jobs' threads.
+            for old_key in [old_key for old_key in cls._cache if old_key[0] == file_path]:
+                del cls._cache[old_key]
+            cls._cache[key] = dataset
+            while len(cls._cache) > max(cls.cache_size, 0):
+                cls._cache.popitem(last=False)
+        return dataset
+
+    @classmethod
+    def forget(cls, file_path: str):
+        """Forgets the datasets loaded from a merged TOF file, before the file is written again."""
+        file_path = _os.path.abspath(file_path)
+        with cls._lock:
+            for key in [key for key in cls._cache if key[0] == file_path]:
+                del cls._cache[key]
+
+    @classmethod
+    def clear_cache(cls):
+        """Forgets all the loaded datasets."""
+        with cls._lock:
+            cls._cache.clear()
+
+    def tof_hist(self, min_: int, max_: int, default_bins=8192) -> tuple[numpy.array, numpy.array, numpy.array]:
+        """Generates the TOF histogram, see `get_cpp_tof_hist`."""
+        y, x = histogram(self.delta_time, default_bins, (min_, max_))
+        return (x, y, self.delta_time)
+
+    def evse_hist(self, xbins: int, ybins: int) -> tuple[numpy.array, numpy.array, numpy.ndarray, tuple[numpy.array, numpy.array]]:
+        """Generates the Energy vs Energy 2D histogram, see `get_cpp_evse_hist`."""
+        density, xedge, yedge = numpy.histogram2d(self.start_energy, self.stop_energy, (xbins, ybins))
+        return (xedge, yedge, density, (self.start_energy, self.stop_energy))
+
+    def tofvse_hist(self, min_: int, max_: int, default_energy_bins=4096, default_tof_bins=8192) -> tuple[numpy.array, numpy.array, numpy.ndarray]:
+        """Generates the TOF vs Energy 2D histogram, see `get_cpp_tofvse_hist`."""
+        min_e = self.stop_energy.min()
+        max_e = self.stop_energy.max()
+        density, xedge, yedge = numpy.histogram2d(self.stop_energy, self.delta_time, [default_energy_bins, default_tof_bins], ((min_e,max_e),(min_,max_)))
+        return (xedge, yedge, density, (self.stop_energy, self.delta_time))
+
 def get_cpp_tof_hist(file_path: str, min_: int, max_: int, default_bins=8192, compress=True) -> tuple[numpy.array, numpy.array, numpy.array]:
     """Generates the TOF histogram
 
     Parameters
     ----------
     file_path : str
-        Path to the csv file containing the time and energy information
+        Path to the file containing the time and energy information (see `load_tof_data`)
     min_ : int
         Minimum time for the TOF bins
     max_ : int
@@ -104,19 +434,14 @@ def get_cpp_tof_hist(file_path: str, min_: int, max_: int, default_bins=8192, co
     default_bins : int, optional
         Number of bins to use for the X axis, by default 8192
     compress : bool, optional
-        Whether the file is compressed or not, by default True
+        Whether the `.csv` file is compressed or not, by default True
 
     Returns
     -------
     output : tuple[numpy.array, numpy.array, numpy.array]
         Tuple containing the x bins, y bins and TOF data.
     """
-    df = pandas.read_csv(file_path, compression="bz2") if compress else pandas.read_csv(file_path)
-    delta_time = (numpy.array(df["Stop Time"]) - numpy.array(df["Start Time"]))*1e-3
-
-    hist = numpy.histogram(delta_time, default_bins, range=(min_, max_))
-    y, x = hist
-    return (x, y, delta_time)
+    return TOFData.load(file_path, compress).tof_hist(min_, max_, default_bins)
 
 def get_cpp_evse_hist(file_path: str, xbins: int, ybins: int, compress=True) -> tuple[numpy.array, numpy.array, numpy.ndarray, tuple[numpy.array, numpy.array]]:
     """Generates the Energy vs Energy 2D histogram
@@ -124,23 +449,20 @@ def get_cpp_evse_hist(file_path: str, xbins: int, ybins: int, compress=True) ->
     Parameters
     ----------
     file_path : str
-        Path to the csv file containing the time and energy information
+        Path to the file containing the time and energy information (see `load_tof_data`)
     xbins : int
         Number of bins on the x-axis
     ybins : int
         Number of bins on the y-axis
     compress : bool, optional
-        Whether the file is compressed or not, by default True
+        Whether the `.csv` file is compressed or not, by default True
 
     Returns
     -------
     output: tuple[numpy.array, numpy.array, numpy.ndarray, tuple[numpy.array, numpy.array]]
         Tuple containing the x bins, y bins and the density (z axis counts) calculated by the histogram. The data used to calculate the histogram is also returned.
     """
-    df = pandas.read_csv(file_path, compression="bz2") if compress else pandas.read_csv(file_path)
-
-    density, xedge, yedge = numpy.histogram2d(df["Start Energy"], df["Stop Energy"], (xbins, ybins))
-    return (xedge, yedge, density, (df["Start Energy"], df["Stop Energy"]))
+    return TOFData.load(file_path, compress).evse_hist(xbins, ybins)
 
 def get_cpp_tofvse_hist(file_path: str, min_: int, max_: int, default_energy_bins=4096, default_tof_bins=8192, compress=True) -> tuple[numpy.array, numpy.array, numpy.ndarray]:
     """Generates the TOF vs Energy 2D histogram
@@ -148,7 +470,7 @@ def get_cpp_tofvse_hist(file_path: str, min_: int, max_: int, default_energy_bin
     Parameters
     ----------
     file_path : str
-        Path to the csv file containing the time and energy information
+        Path to the file containing the time and energy information (see `load_tof_data`)
     min_ : int
         Minimum time for the TOF bins
     max_ : int
@@ -158,20 +480,14 @@ def get_cpp_tofvse_hist(file_path: str, min_: int, max_: int, default_energy_bin
     default_tof_bins : int, optional
         Number of bins to use for the Y axis, by default 8192
     compress : bool, optional
-        Whether the file is compressed or not, by default True
+        Whether the `.csv` file is compressed or not, by default True
 
     Returns
     -------
     output: tuple[numpy.array, numpy.array, numpy.ndarray]
         Tuple containing the x bins, y bins and the density (z axis counts) calculated by the histogram.
     """
-    df = pandas.read_csv(file_path, compression="bz2") if compress else pandas.read_csv(file_path)
-    min_e = min(df["Stop Energy"])
-    max_e = max(df["Stop Energy"])
-    
-    tof_data = get_cpp_tof_hist(file_path, min_, max_, default_tof_bins)[2] #Grab only the time differences
-    density, xedge, yedge = numpy.histogram2d(df["Stop Energy"], tof_data, [default_energy_bins, default_tof_bins], ((min_e,max_e),(min_,max_)))
-    return (xedge, yedge, density, (df["Stop Energy"], tof_data))
+    return TOFData.load(file_path, compress).tofvse_hist(min_, max_, default_energy_bins, default_tof_bins)
 
 
 class _root_reader():
@@ -233,8 +549,7 @@ class _root_reader():
 
 
     def calc_psd(self, data):
-        psd_func = numpy.vectorize(self.PSD)
-        PSD_values = psd_func(data['Energy'], data['EnergyShort'])
+        PSD_values = calculate_psd(data['Energy'], data['EnergyShort'])
         data.insert(2, 'PSD', PSD_values)
         
 
@@ -446,6 +761,205 @@ class _root_reader():
         data.insert(5, 'Timestamp [s]', timestamps_in_seconds)
         data.to_csv(filepath.split('.')[0]+'.csv', index=False)
 
+class DatasetCache:
+    """Least recently used cache of the branches read from the root files, shared by all the readers of the process.
+
+    The files are identified by their path, TTree key, modification time and size so that a file rewritten by CoMPASS is read again. The cached arrays are read-only.
+
+    Parameters
+    ----------
+    max_bytes : int, optional
+        Memory budget of the cache in bytes, by default `None` which uses `default_max_bytes`
+    """
+    default_max_bytes = 2 * 1024**3
+
+    def __init__(self, max_bytes: int = None):
+        self._entries: collections.OrderedDict[tuple, dict[str, numpy.array]] = collections.OrderedDict()
+        self._nbytes = 0
+        self._lock = threading.RLock()
+        self.max_bytes = self.default_max_bytes if max_bytes is None else max_bytes
+
+    @staticmethod
+    def make_key(file_path: str, tree: str) -> tuple[str, str, int, int] | None:
+        """Generates the key of a file, `None` if the file can't be found."""
+        try:
+            stat = _os.stat(file_path)
+        except OSError:
+            return
+        return (_os.path.abspath(file_path), tree, stat.st_mtime_ns, stat.st_size)
+
+    @property
+    def max_bytes(self) -> int:
+        """Memory budget of the cache in bytes, lowering it evicts the least recently used files right away."""
+        return self._max_bytes
+
+    @max_bytes.setter
+    def max_bytes(self, value: int):
+        with self._lock:
+            self._max_bytes = value
+            self.evict()
+
+    @property
+    def nbytes(self) -> int:
+        """Memory used by the cached arrays."""
+        return self._nbytes
+
+    def get(self, key: tuple, branches: list[str]) -> dict[str, numpy.array] | None:
+        """Gives the cached branches of a file, `None` unless all of them are cached."""
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None or any(branch not in entry for branch in branches):
+                return
+            self._entries.move_to_end(key)
+            return {branch: entry[branch] for branch in branches}
+
+    def put(self, key: tuple, data: dict[str, numpy.array]):
+        """Adds branches of a file to the cache and evicts the least recently used files over the memory budget."""
+        with self._lock:
+            for old_key in [old_key for old_key in self._entries if old_key[:2] == key[:2] and old_key != key]:
+                self.pop(old_key) #The file changed since it was cached.
+
+            entry = self._entries.setdefault(key, {})
+            self._entries.move_to_end(key)
+            for branch, array in data.items():
+                if branch in entry:
+                    continue
+                array.flags.writeable = False
+                entry[branch] = array
+                self._nbytes += array.nbytes
+            self.evict()
+
+    def evict(self):
+        """Removes the least recently used files until the cache fits in its memory budget."""
+        with self._lock:
+            while self._nbytes > self._max_bytes and len(self._entries) != 0:
+                self.pop(next(iter(self._entries)))
+
+    def pop(self, key: tuple):
+        """Removes a file from the cache."""
+        with self._lock:
+            entry = self._entries.pop(key, {})
+            self._nbytes -= sum(array.nbytes for array in entry.values())
+
+    def clear(self):
+        """Removes all the files from the cache."""
+        with self._lock:
+            self._entries.clear()
+            self._nbytes = 0
+
+dataset_cache = DatasetCache()
+
+class Sidecar:
+    """Uncompressed copy of the branches of a root file, with one little-endian `.npy` file per branch, loaded as read-only memory maps.
+
+    Reading a branch from the sidecar doesn't decompress anything and the pages are shared by all the processes through the OS page cache. The sidecar is only used while the root file keeps the size and modification time it had when the sidecar was written.
+
+    Parameters
+    ----------
+    file_path : str
+        Path to the root file
+    tree : str
+        Key for the TTree inside the root file
+    directory : str, optional
+        Folder where the sidecars are stored, by default `None` which stores them next to the root file
+    """
+    folder_name = ".sidecar"
+    info_name = "info.json"
+
+    def __init__(self, file_path: str, tree: str, directory: str = None):
+        self.file_path = _os.path.abspath(file_path)
+        self.tree = tree
+        directory = _os.path.dirname(self.file_path) if directory is None else directory
+        path_hash = hashlib.sha1(self.file_path.encode()).hexdigest()[:12] #Keeps the files of different folders apart in a shared directory.
+        self.folder = _os.path.join(directory, self.folder_name, f"{_os.path.basename(self.file_path)}.{tree}.{path_hash}")
+
+    def branch_path(self, branch: str) -> str:
+        return _os.path.join(self.folder, f"{branch}.npy")
+
+    def read_info(self) -> dict | None:
+        """Reads the description of the root file the sidecar was written from, `None` if there is no sidecar."""
+        try:
+            with open(_os.path.join(self.folder, self.info_name), "r") as f:
+                return json.load(f)
+        except (OSError, ValueError):
+            return
+
+    @staticmethod
+    def matches(info: dict | None, key: tuple[str, str, int, int]) -> bool:
+        """Checks that the sidecar was written from the current version of the root file."""
+        return info is not None and [info.get(name) for name in ["file", "tree", "mtime_ns", "size"]] == list(key)
+
+    def load(self, key: tuple[str, str, int, int], branches: list[str]) -> dict[str, numpy.memmap] | None:
+        """Memory maps the branches of the sidecar.
+
+        Parameters
+        ----------
+        key : tuple[str, str, int, int]
+            Current key of the root file given by `DatasetCache.make_key`
+        branches : list[str]
+            Branches to load
+
+        Returns
+        -------
+        data : dict[str, numpy.memmap] | None
+            Read-only arrays of the branches, `None` unless the sidecar is up to date and has all the branches.
+        """
+        info = self.read_info()
+        if not self.matches(info, key):
+            return
+
+        data = {}
+        for branch in branches:
+            try:
+                array = numpy.load(self.branch_path(branch), mmap_mode="r")
+            except (OSError, ValueError):
+                return
+            if len(array) != info["entries"]:
+                return
+            data[branch] = array
+        return data
+
+    def save(self, key: tuple[str, str, int, int], data: dict[str, numpy.array]) -> bool:
+        """Writes branches to the sidecar, replacing it if it was written from an older version of the root file.
+
+        Parameters
+        ----------
+        key : tuple[str, str, int, int]
+            Key of the root file when the branches were read, given by `DatasetCache.make_key`
+        data : dict[str, numpy.array]
+            Arrays of the branches
+
+        Returns
+        -------
+        saved : bool
+            Whether the sidecar could be written, the folder can be read-only.
+        """
+        info = {"file": key[0], "tree": key[1], "mtime_ns": key[2], "size": key[3], "entries": len(next(iter(data.values()))) if data else 0}
+        try:
+            if not self.matches(self.read_info(), key):
+                self.clear()
+            _os.makedirs(self.folder, exist_ok=True)
+            for branch, array in data.items():
+                temporary_path = self.branch_path(branch) + ".part"
+                with open(temporary_path, "wb") as f:
+                    numpy.save(f, numpy.ascontiguousarray(array, dtype=array.dtype.newbyteorder("<")))
+                _os.replace(temporary_path, self.branch_path(branch))
+            temporary_path = _os.path.join(self.folder, self.info_name + ".part")
+            with open(temporary_path, "w") as f:
+                json.dump(info, f)
+            _os.replace(temporary_path, _os.path.join(self.folder, self.info_name)) #Written last so that a stopped write is never loaded.
+        except OSError:
+            return False
+        return True
+
+    def clear(self):
+        """Deletes the files of the sidecar."""
+        if not _os.path.isdir(self.folder):
+            return
+        for name in _os.listdir(self.folder):
+            _os.remove(_os.path.join(self.folder, name))
+
+
 class root_reader_v2():
     """
     A file reader capable of getting information from a `.root` file.
@@ -456,10 +970,62 @@ class root_reader_v2():
         Path of the file we want to read
     tree : str
         Key for the TTree inside the root file
+    step_size : int | str, optional
+        Size of the batches used to stream the file, either a number of entries or a memory size like `"100 MB"`, by default `None` which loads the whole file at once.
+    decompression_executor : optional
+        Executor (with a `submit` method) decompressing the baskets of the file, by default `None` which uses the thread pool shared by all the readers
+    interpretation_executor : optional
+        Executor (with a `submit` method) turning the decompressed baskets into arrays, by default `None` which uses the thread pool shared by all the readers
     """
-    def __init__(self, file_path: str, tree: str):
+    branches = ["Channel", "Timestamp", "Board", "Energy", "EnergyShort", "Flags"]
+    default_step_size = "100 MB"
+    psd_dtype = numpy.float64
+    use_cache = True
+    use_sidecar = False #Whether the branches read from a file are also written to an uncompressed `Sidecar`, which is memory mapped by the next reads.
+    sidecar_directory = None #Folder of the sidecars, `None` to store them next to the root files.
+    decompression_workers = None #Threads of the shared pool decompressing the baskets, `None` for the number of processors and `0` or `1` to decompress in the reading thread.
+    interpretation_workers = None #Threads of the shared pool interpreting the baskets, same values as `decompression_workers`.
+    _executors = {}
+    _executors_lock = threading.Lock()
+
+    def __init__(self, file_path: str, tree: str, step_size: int | str = None, decompression_executor=None, interpretation_executor=None):
         self.file_path = file_path
         self.tree = tree
+        self.step_size = step_size
+        self.decompression_executor = decompression_executor
+        self.interpretation_executor = interpretation_executor
+
+    @classmethod
+    def get_shared_executor(cls, workers: int | None):
+        """Returns the thread pool shared by all the readers for a number of workers, created on first use.
+
+        Parameters
+        ----------
+        workers : int | None
+            Number of threads, `None` for the number of processors
+
+        Returns
+        -------
+        executor : uproot.ThreadPoolExecutor | None
+            Shared thread pool, `None` for less than two workers so that uproot works in the reading thread.
+        """
+        workers = _os.cpu_count() if workers is None else workers
+        if workers is None or workers < 2:
+            return
+        with cls._executors_lock:
+            if workers not in cls._executors:
+                cls._executors[workers] = _ur.ThreadPoolExecutor(workers) #Never attached to a file, uproot shuts those down when the file closes.
+            return cls._executors[workers]
+
+    def reader_for(self, file_path: str, step_size: int | str = None) -> "root_reader_v2":
+        """Creates a reader for the same TTree of another file (like the stop channel), using the same executors."""
+        return root_reader_v2(file_path, self.tree, step_size, self.decompression_executor, self.interpretation_executor)
+
+    def get_executors(self) -> dict:
+        """Returns the decompression and interpretation executors given to uproot when reading the TTree."""
+        decompression_executor = self.get_shared_executor(self.decompression_workers) if self.decompression_executor is None else self.decompression_executor
+        interpretation_executor = self.get_shared_executor(self.interpretation_workers) if self.interpretation_executor is None else self.interpretation_executor
+        return {"decompression_executor": decompression_executor, "interpretation_executor": interpretation_executor}
 
     @staticmethod
     def PSD(energy_long: int, energy_short: int) -> float:
@@ -484,21 +1050,23 @@ class root_reader_v2():
 
         return value
 
-    def calculate_PSD(self, data: pandas.DataFrame):
+    def calculate_PSD(self, data: pandas.DataFrame, dtype=None):
         """Calculates the PSD values for a dataset.
 
         Parameters
         ----------
         data : pandas.DataFrame
             Dataset used to calculate the PSD values
+        dtype : optional
+            Data type of the PSD values (`numpy.float32` halves their memory), by default `None` which uses `psd_dtype`
         """
-        psd_func = numpy.vectorize(self.PSD)
-        psd_values = psd_func(data["Energy"], data["EnergyShort"])
-        data.insert(2, "PSD", psd_values)
+        dtype = self.psd_dtype if dtype is None else dtype
+        psd_values = calculate_psd(data["Energy"], data["EnergyShort"], dtype)
+        data.insert(min(2, len(data.columns)), "PSD", psd_values)
 
 
 
-    def open(self, raw=False, check_flags=False) -> pandas.DataFrame:
+    def open(self, raw=False, check_flags=False, psd=True, keys: list[str] = None) -> pandas.DataFrame:
         """Opens the selected file
 
         .. note::
@@ -510,47 +1078,299 @@ class root_reader_v2():
             Whether we downcast the timestamps to integers or keep them as unsigned integers, by default False
         check_flags : bool, optional
             Whether we print out the different flags found in the selected file, by default False
+        psd : bool, optional
+            Whether we calculate the PSD values, by default True
+        keys : list[str], optional
+            Branches to read, `"PSD"` included (replaces `psd`), by default `None` which reads all the `branches`
 
         Returns
         -------
         filtered_data : pandas.DataFrame
             Downcasted timestamp data with all the rest of the file's data.
         """
+        branches, psd = self.get_branches(keys, psd)
+        data = self.read_branches(branches)
+        if data is None or len(data[branches[0]]) == 0:
+            return
+
+        filtered_dataframe = self.to_dataframe(data, raw, psd)
+
+        if check_flags:
+            flags = set(filtered_dataframe["Flags"])
+            for flag in flags:
+                print(list(filtered_dataframe["Flags"]).count(flag), flag)
+            #  print(list(filtered_dataframe["Flags"]).count(16512))
+
+        return filtered_dataframe
+
+    def get_branches(self, keys: list[str] = None, psd=True) -> tuple[list[str], bool]:
+        """Finds the branches to read for the requested keys. The PSD values need the `Energy` and `EnergyShort` branches and are only calculated if `"PSD"` is requested when keys are given.
+
+        Parameters
+        ----------
+        keys : list[str], optional
+            Requested branches, `"PSD"` included, by default `None` which requests all the `branches`
+        psd : bool, optional
+            Whether the PSD values are needed when no keys are given, by default True
+
+        Returns
+        -------
+        output_tuple : tuple[list[str], bool]
+            Branches to read and whether the PSD values are needed.
+        """
+        if keys is None:
+            keys = self.branches
+        else:
+            psd = "PSD" in keys
+        branches = [key for key in keys if key != "PSD"]
+        if psd:
+            branches += [key for key in ["Energy", "EnergyShort"] if key not in branches]
+        return branches, psd
+
+    def read_branches(self, branches: list[str]) -> dict[str, numpy.array] | None:
+        """Reads branches of the TTree, going through the `dataset_cache` if `use_cache` is set to `True` and through the file's `Sidecar` if `use_sidecar` is set to `True`.
+
+        Parameters
+        ----------
+        branches : list[str]
+            Branches to read
+
+        Returns
+        -------
+        data : dict[str, numpy.array] | None
+            Arrays of the branches, `None` if the file can't be opened.
+        """
+        key = DatasetCache.make_key(self.file_path, self.tree) if self.use_cache or self.use_sidecar else None
+        if key is not None and self.use_cache:
+            data = dataset_cache.get(key, branches)
+            if data is not None:
+                return data
+
+        sidecar = self.get_sidecar() if key is not None and self.use_sidecar else None
+        if sidecar is not None:
+            data = sidecar.load(key, branches)
+            if data is not None:
+                return data #Already shared through the page cache, no need to keep a copy in the dataset_cache.
+
         try:
             root = _ur.open(self.file_path)
         except:
             return
 
-        tree = root[self.tree]
-        keys = ["Channel", "Timestamp", "Board", "Energy", "EnergyShort", "Flags"]
-        data = tree.arrays(keys, library="np")
+        with root:
+            data = root[self.tree].arrays(branches, library="np", **self.get_executors())
 
-        if len(data["Channel"]) == 0:
-            return
+        if sidecar is not None:
+            sidecar.save(key, data)
+        if key is not None and self.use_cache:
+            dataset_cache.put(key, data)
+        return data
+
+    def get_sidecar(self) -> Sidecar:
+        """Returns the sidecar of the file, which may not be written yet."""
+        return Sidecar(self.file_path, self.tree, self.sidecar_directory)
 
+    def to_dataframe(self, data: dict[str, numpy.array], raw=False, psd=True) -> pandas.DataFrame:
+        """Formats the branches read from the file into a dataframe and adds the PSD values if needed.
+
+        Parameters
+        ----------
+        data : dict[str, numpy.array]
+            Branches read from the TTree
+        raw : bool, optional
+            Whether we downcast the timestamps to integers or keep them as unsigned integers, by default False
+        psd : bool, optional
+            Whether we calculate the PSD values, by default True
+
+        Returns
+        -------
+        filtered_data : pandas.DataFrame
+            Dataframe containing the branches and the PSD values.
+        """
         filtered_dataframe = pandas.DataFrame(data)
 
-        if not raw:
+        if not raw and "Timestamp" in data:
             timestamps = data["Timestamp"]
             formatted_timestamps = pandas.to_numeric(timestamps, downcast="integer")
+            location = filtered_dataframe.columns.get_loc("Timestamp")
             filtered_dataframe = filtered_dataframe.drop("Timestamp", axis=1)
-            filtered_dataframe.insert(1, "Timestamp", formatted_timestamps)
+            filtered_dataframe.insert(location, "Timestamp", formatted_timestamps)
 
-        self.calculate_PSD(filtered_dataframe)
+        if psd:
+            self.calculate_PSD(filtered_dataframe)
+        return filtered_dataframe
 
-        if check_flags:
-            flags = set(filtered_dataframe["Flags"])
-            for flag in flags:
-                print(list(filtered_dataframe["Flags"]).count(flag), flag)
-            #  print(list(filtered_dataframe["Flags"]).count(16512))
+    def iterate(self, raw=False, step_size: int | str = None, psd=True, keys: list[str] = None) -> typing.Iterator[pandas.DataFrame]:
+        """Streams the selected file in batches so that the whole file never has to fit in memory.
 
-        root.close()
+        .. note::
+        Yields nothing if the file can't be opened or doesn't contain any data.
 
-        return filtered_dataframe
+        Parameters
+        ----------
+        raw : bool, optional
+            Whether we downcast the timestamps to integers or keep them as unsigned integers, by default False
+        step_size : int | str, optional
+            Number of entries or memory size (`"100 MB"`) of each batch, by default `None` which uses the reader's `step_size`
+        psd : bool, optional
+            Whether we calculate the PSD values, by default True
+        keys : list[str], optional
+            Branches to read, `"PSD"` included (replaces `psd`), by default `None` which reads all the `branches`
+
+        Yields
+        ------
+        batch : pandas.DataFrame
+            Batch of the file formatted like the output of `open`.
+        """
+        branches, psd = self.get_branches(keys, psd)
+        step_size = self.get_step_size() if step_size is None else step_size
+        try:
+            root = _ur.open(self.file_path)
+        except:
+            return
+
+        with root:
+            tree = root[self.tree]
+            key = DatasetCache.make_key(self.file_path, self.tree) if self.use_sidecar else None
+            sidecar = self.get_sidecar().load(key, branches) if key is not None else None
+            if sidecar is not None: #Slices of the memory maps, nothing to decompress.
+                step_entries = step_size if isinstance(step_size, int) else max(1, tree.num_entries_for(step_size, branches))
+                for start in range(0, tree.num_entries, step_entries):
+                    yield self.to_dataframe({branch: array[start:start+step_entries] for branch, array in sidecar.items()}, raw, psd)
+                return
+
+            for data in tree.iterate(branches, step_size=step_size, library="np", **self.get_executors()):
+                if len(data[branches[0]]) == 0:
+                    continue
+                yield self.to_dataframe(data, raw, psd)
+
+    def get_step_size(self) -> int | str:
+        """Returns the step size used to stream the file."""
+        return self.default_step_size if self.step_size is None else self.step_size
+
+    def get_step_entries(self, keys: list[str] = None) -> int:
+        """Converts the step size into a number of entries of the given branches so that two files can be streamed side by side."""
+        step_size = self.get_step_size()
+        if isinstance(step_size, int):
+            return step_size
+        with _ur.open(self.file_path) as root:
+            return max(1, root[self.tree].num_entries_for(step_size, self.get_branches(keys, False)[0]))
+
+    def probe(self) -> dict[str, int | dict[str, str]] | None:
+        """Reads the number of entries and the branches of the TTree from the file's metadata, without decompressing any data.
+
+        Returns
+        -------
+        metadata : dict[str, int | dict[str, str]] | None
+            Number of entries (`"entries"`) and type name of each branch (`"branches"`), `None` if the file or the TTree can't be opened.
+        """
+        try:
+            with _ur.open(self.file_path) as root:
+                tree = root[self.tree]
+                return {"entries": tree.num_entries, "branches": {key: branch.typename for key, branch in tree.items()}}
+        except:
+            return
+
+    def has_data(self) -> bool:
+        """Checks from the file's metadata that the file contains entries and all the `branches` that are read."""
+        metadata = self.probe()
+        if metadata is None or metadata["entries"] == 0:
+            return False
+        return all(branch in metadata["branches"] for branch in self.branches)
+
+    def get_num_entries(self) -> int:
+        """Returns the number of entries of the file, `0` if the file can't be opened."""
+        metadata = self.probe()
+        return 0 if metadata is None else metadata["entries"]
+
+    def stream_limits(self, column: typing.Callable[[pandas.DataFrame], numpy.array], psd=False, keys: list[str] = None) -> tuple[float, float]:
+        """Finds the minimum and maximum of a column over the whole file, batch by batch.
+
+        Parameters
+        ----------
+        column : typing.Callable[[pandas.DataFrame], numpy.array]
+            Function returning the values of a batch
+        psd : bool, optional
+            Whether the batches need the PSD values, by default False
+        keys : list[str], optional
+            Branches needed by the column, by default `None` which reads all the `branches`
+
+        Returns
+        -------
+        limits : tuple[float, float]
+            Minimum and maximum values, `(0, 1)` if the file is empty like `numpy.histogram`.
+        """
+        minimum, maximum = numpy.inf, -numpy.inf
+        for batch in self.iterate(psd=psd, keys=keys):
+            values = numpy.asarray(column(batch))
+            if len(values) == 0:
+                continue
+            minimum = min(minimum, float(values.min()))
+            maximum = max(maximum, float(values.max()))
+
+        if minimum > maximum:
+            return (0., 1.)
+        return (minimum, maximum)
+
+    def stream_hist(self, column: typing.Callable[[pandas.DataFrame], numpy.array], bins: int, range_: tuple[float, float] = None, psd=False, keys: list[str] = None) -> tuple[numpy.array, numpy.array]:
+        """Fills a histogram batch by batch. Gives the same bins and counts as `numpy.histogram` over the whole column.
+
+        Parameters
+        ----------
+        column : typing.Callable[[pandas.DataFrame], numpy.array]
+            Function returning the values of a batch
+        bins : int
+            Number of bins used by the histogram
+        range_ : tuple[float, float], optional
+            Range of the histogram, by default `None` which uses the minimum and maximum of the column
+        psd : bool, optional
+            Whether the batches need the PSD values, by default False
+        keys : list[str], optional
+            Branches needed by the column, by default `None` which reads all the `branches`
+
+        Returns
+        -------
+        output_tuple : tuple[numpy.array, numpy.array]
+            Tuple containing the x data and the y data of the histogram.
+        """
+        range_ = self.stream_limits(column, psd, keys) if range_ is None else range_
+        y = numpy.zeros(bins, dtype=numpy.intp)
+        for batch in self.iterate(psd=psd, keys=keys):
+            y += histogram(column(batch), bins, range_)[0]
+        x = numpy.histogram_bin_edges([], bins=bins, range=range_)
+        return (x, y)
+
+    def stream_pairs(self, stop_file: str, keys: list[str] = None) -> typing.Iterator[tuple[pandas.DataFrame, pandas.DataFrame]]:
+        """Streams this file and the stop file side by side with batches of the same number of entries.
+
+        Parameters
+        ----------
+        stop_file : str
+            Path to the stop channel's root file
+        keys : list[str], optional
+            Branches to read from both files, by default `None` which reads all the `branches`
+
+        Yields
+        ------
+        batches : tuple[pandas.DataFrame, pandas.DataFrame]
+            Start and stop batches covering the same entries.
+        """
+        stop_reader = self.reader_for(stop_file, self.step_size)
+        step_entries = self.get_step_entries(keys)
+        yield from zip(self.iterate(step_size=step_entries, psd=False, keys=keys), stop_reader.iterate(step_size=step_entries, psd=False, keys=keys))
 
     def __len__(self) -> int:
-        data = self.open()
-        return len(data)
+        return self.get_num_entries()
+
+    def empty_file_error(self) -> ValueError:
+        return ValueError(f"{_os.path.basename(self.file_path)} doesn't contain any data.")
+
+    def open_data(self, keys: list[str]) -> pandas.DataFrame:
+        """Opens the branches needed by a histogram, like `open`, but raises a `ValueError` if the file doesn't contain any data."""
+        data = self.open(keys=keys)
+        if data is None:
+            raise self.empty_file_error()
+        return data
 
     def get_energy_hist(self, default_bins=4096, **kwargs) -> tuple[numpy.array, numpy.array, pandas.Series]:
         """Generates the energy histogram's data
@@ -563,11 +1383,15 @@ class root_reader_v2():
         Returns
         -------
         output_tuple : tuple[numpy.array, numpy.array, pandas.Series]
-            Tuple containing the x data, y data and raw data used to create the histogram.
+            Tuple containing the x data, y data and raw data used to create the histogram. The raw data is `None` if the file is streamed.
         """
         default_bins = default_bins if kwargs.get("bins") is None else kwargs.get("bins")
-        data = self.open()
-        hist = numpy.histogram(data["Energy"], bins=default_bins)
+        if self.step_size is not None:
+            x, y = self.stream_hist(lambda batch: batch["Energy"], default_bins, keys=["Energy"])
+            return (x, y, None)
+
+        data = self.open_data(["Energy"])
+        hist = histogram(data["Energy"], default_bins)
         y, x = hist
         return (x, y, data["Energy"])
 
@@ -582,11 +1406,15 @@ class root_reader_v2():
         Returns
         -------
         output_tuple : tuple[numpy.array, numpy.array, pandas.Series]
-            Tuple containing the x data, y data and raw data used to create the histogram.
+            Tuple containing the x data, y data and raw data used to create the histogram. The raw data is `None` if the file is streamed.
         """
         default_bins = default_bins if kwargs.get("bins") is None else kwargs.get("bins")
-        data = self.open()
-        hist = numpy.histogram(data["PSD"], bins=default_bins, range=(0,1))
+        if self.step_size is not None:
+            x, y = self.stream_hist(lambda batch: batch["PSD"], default_bins, (0,1), keys=["PSD"])
+            return (x, y, None)
+
+        data = self.open_data(["PSD"])
+        hist = histogram(data["PSD"], default_bins, (0,1))
         y, x = hist
         return (x, y, data["PSD"])
 
@@ -605,12 +1433,23 @@ class root_reader_v2():
         Returns
         -------
         output_tuple : tuple[numpy.array, numpy.array, numpy.array]
-            Tuple containing the x data, the y data and the raw data used to create the histogram.
+            Tuple containing the x data, the y data and the raw data used to create the histogram. The raw data is `None` if the file is streamed.
         """
         default_bins = default_bins if kwargs.get("bins") is None else kwargs.get("bins")
-        data = self.open()
+        if self.step_size is not None:
+            y = numpy.zeros(default_bins, dtype=numpy.intp)
+            previous = None
+            for batch in self.iterate(keys=["Timestamp"]):
+                timestamps = numpy.asarray(batch["Timestamp"]/1000)
+                time_difference = numpy.ediff1d(timestamps, to_begin=None if previous is None else timestamps[0] - previous)
+                y += histogram(time_difference, default_bins, (min_,max_))[0]
+                previous = timestamps[-1]
+            x = numpy.histogram_bin_edges([], bins=default_bins, range=(min_,max_))
+            return (x, y, None)
+
+        data = self.open_data(["Timestamp"])
         time_difference = numpy.ediff1d(data["Timestamp"]/1000)
-        hist = numpy.histogram(time_difference, bins=default_bins, range=(min_,max_))
+        hist = histogram(time_difference, default_bins, (min_,max_))
         y, x = hist
         return (x, y, time_difference)
 
@@ -634,10 +1473,20 @@ class root_reader_v2():
         Returns
         -------
         output_tuple : tuple[numpy.array, numpy.array, numpy.array]
-            Tuple containing the x data, the y data and the raw data used to create the histogram.
+            Tuple containing the x data, the y data and the raw data used to create the histogram. The raw data is `None` if the files are streamed.
         """
-        data_start = self.open()
-        data_stop = root_reader_v2(stop_file, self.tree).open()
+        if self.step_size is not None:
+            if self.get_num_entries() != self.reader_for(stop_file).get_num_entries():
+                return
+            y = numpy.zeros(default_bins, dtype=numpy.intp)
+            for batch_start, batch_stop in self.stream_pairs(stop_file, ["Timestamp"]):
+                delta_time = (numpy.array(batch_stop["Timestamp"]) - numpy.array(batch_start["Timestamp"]))*1e-3
+                y += histogram(delta_time, default_bins, (min_, max_))[0]
+            x = numpy.histogram_bin_edges([], bins=default_bins, range=(min_, max_))
+            return (x, y, None)
+
+        data_start = self.open_data(["Timestamp"])
+        data_stop = self.reader_for(stop_file).open_data(["Timestamp"])
         # print(len(data_stop))
         
         try:
@@ -645,7 +1494,7 @@ class root_reader_v2():
         except:
             return
 
-        hist = numpy.histogram(delta_time, default_bins, range=(min_, max_))
+        hist = histogram(delta_time, default_bins, (min_, max_))
         y, x = hist
         return (x, y, delta_time)
 
@@ -667,10 +1516,22 @@ class root_reader_v2():
         Returns
         -------
         output_tuple: tuple[numpy.array, numpy.array, numpy.ndarray]
-            Tuple containing the x bins, y bins and the density (z axis counts) calculated the the histogram.
+            Tuple containing the x bins, y bins and the density (z axis counts) calculated the the histogram. The raw data is `None` if the files are streamed.
         """
-        data_start = self.open()
-        data_stop = root_reader_v2(stop_file, self.tree).open()
+        if self.step_size is not None:
+            if self.get_num_entries() != self.reader_for(stop_file).get_num_entries():
+                return
+            x_range = self.stream_limits(lambda batch: batch["Energy"], keys=["Energy"])
+            y_range = self.reader_for(stop_file, self.step_size).stream_limits(lambda batch: batch["Energy"], keys=["Energy"])
+            density = numpy.zeros((xbins, ybins), dtype=numpy.float64)
+            for batch_start, batch_stop in self.stream_pairs(stop_file, ["Energy"]):
+                density += numpy.histogram2d(batch_start["Energy"], batch_stop["Energy"], (xbins, ybins), (x_range, y_range))[0]
+            xedge = numpy.histogram_bin_edges([], bins=xbins, range=x_range)
+            yedge = numpy.histogram_bin_edges([], bins=ybins, range=y_range)
+            return (xedge, yedge, density, None)
+
+        data_start = self.open_data(["Energy"])
+        data_stop = self.reader_for(stop_file).open_data(["Energy"])
         
         try:
             density, xedge, yedge = numpy.histogram2d(data_start["Energy"], data_stop["Energy"], (xbins, ybins))
@@ -701,13 +1562,26 @@ class root_reader_v2():
         Returns
         -------
         output_tuple : tuple[numpy.array, numpy.array, numpy.array]
-            Tuple containing the x bins, y bins and the density (z axis counts) calculated by the histogram.
+            Tuple containing the x bins, y bins and the density (z axis counts) calculated by the histogram. The raw data is `None` if the files are streamed.
         """
-        tof_data = self.get_tof_hist(stop_file,min_,max_, default_tof_bins)[2]
-        stop_data = root_reader_v2(stop_file, self.tree).open()
-        min_e = min(stop_data["Energy"])
-        max_e = max(stop_data["Energy"])
+        if self.step_size is not None:
+            if self.get_num_entries() != self.reader_for(stop_file).get_num_entries():
+                return
+            energy_range = self.reader_for(stop_file, self.step_size).stream_limits(lambda batch: batch["Energy"], keys=["Energy"])
+            density = numpy.zeros((default_energy_bins, default_tof_bins), dtype=numpy.float64)
+            for batch_start, batch_stop in self.stream_pairs(stop_file, ["Timestamp", "Energy"]):
+                tof_data = (numpy.array(batch_stop["Timestamp"]) - numpy.array(batch_start["Timestamp"]))*1e-3
+                density += numpy.histogram2d(batch_stop["Energy"], tof_data, [default_energy_bins, default_tof_bins], (energy_range, (min_,max_)))[0]
+            xedge = numpy.histogram_bin_edges([], bins=default_energy_bins, range=energy_range)
+            yedge = numpy.histogram_bin_edges([], bins=default_tof_bins, range=(min_,max_))
+            return (xedge, yedge, density, None)
+
+        data_start = self.open_data(["Timestamp"])
+        stop_data = self.reader_for(stop_file).open_data(["Timestamp", "Energy"])
         try:
+            tof_data = (numpy.array(stop_data["Timestamp"]) - numpy.array(data_start["Timestamp"]))*1e-3
+            min_e = min(stop_data["Energy"])
+            max_e = max(stop_data["Energy"])
             density, xedge, yedge = numpy.histogram2d(stop_data["Energy"], tof_data, [default_energy_bins, default_tof_bins], ((min_e,max_e),(min_,max_)))
         except:
             return
@@ -726,27 +1600,55 @@ class root_reader_v2():
         Returns
         -------
         output_tuple : tuple[numpy.array, numpy.array, numpy.array]
-            Tuple containing the x bins, y bins and the density (z axis counts) calculated by the histogram.
+            Tuple containing the x bins, y bins and the density (z axis counts) calculated by the histogram. The raw data is `None` if the file is streamed.
         """
-        data = self.open()
+        if self.step_size is not None:
+            energy_range = self.stream_limits(lambda batch: batch["Energy"], keys=["Energy"])
+            density = numpy.zeros((default_energy_bins, default_psd_bins), dtype=numpy.float64)
+            for batch in self.iterate(keys=["Energy", "PSD"]):
+                density += numpy.histogram2d(batch["Energy"], batch["PSD"], [default_energy_bins, default_psd_bins], range=(energy_range,(0,1)))[0]
+            xedge = numpy.histogram_bin_edges([], bins=default_energy_bins, range=energy_range)
+            yedge = numpy.histogram_bin_edges([], bins=default_psd_bins, range=(0,1))
+            return (xedge, yedge, density, None)
+
+        data = self.open_data(["Energy", "PSD"])
         min_e = min(data["Energy"])
         max_e = max(data["Energy"])
         density, xedge, yedge = numpy.histogram2d(data["Energy"], data["PSD"], [default_energy_bins, default_psd_bins], range=((min_e,max_e),(0,1)))
         return (xedge, yedge, density, (data["Energy"], data["PSD"]))
 
+    @staticmethod
+    def check_mcs_bins(t0: int, t1: int):
+        """Raises a `ValueError` if the run is too short to have one bin of one second in the MCS graph."""
+        if t1 <= t0:
+            raise ValueError("the run lasts less than one second, the MCS graph has no bins.")
+
     def get_mcs_graph(self) -> tuple[numpy.array, numpy.array, pandas.Series]:
         """Generates the MCS graph's data
 
         Returns
         -------
         output_tuple : tuple[numpy.array, numpy.array, pandas.Series]
-            Tuple containing the x data, y data and the raw data used for the graph.
+            Tuple containing the x data, y data and the raw data used for the graph. The raw data is `None` if the file is streamed.
         """
-        data = self.open()
+        if self.step_size is not None:
+            with _ur.open(self.file_path) as root:
+                tree = root[self.tree]
+                if tree.num_entries == 0:
+                    raise self.empty_file_error()
+                last_timestamp = tree["Timestamp"].array(entry_start=tree.num_entries-1, library="np")[0]
+            t0 = 0 #seconds
+            t1 = int(last_timestamp/10**12) #seconds
+            self.check_mcs_bins(t0, t1)
+            x, y = self.stream_hist(lambda batch: batch['Timestamp']/10**12, t1-t0, (t0,t1), keys=["Timestamp"])
+            return (x[1:], y, None)
+
+        data = self.open_data(["Timestamp"])
         t0 = 0 #seconds
         t1 = int(data['Timestamp'][len(data)-1]/10**12) #seconds
+        self.check_mcs_bins(t0, t1)
         n_bins = t1-t0
-        hist = numpy.histogram(data['Timestamp']/10**12, bins=n_bins, range=(t0,t1))
+        hist = histogram(data['Timestamp']/10**12, n_bins, (t0,t1))
         x = hist[1][1:]
         y = hist[0]
         return (x, y, data['Timestamp']/10**12)
@@ -762,6 +1664,145 @@ class root_reader_v2():
     
     
 
+class EventStream():
+    """
+    Reads the `.root` files of several channels side by side and yields their events in time order, batch by batch.
+
+    A heap keeps each channel's current batch ordered by its last timestamp. The smallest of those timestamps is the limit up to which every event is known, so all the buffered events up to it can be merged and yielded. The channel that set the limit then reads its next batch. Only one batch per channel is held in memory, whatever the length of the run.
+
+    .. note::
+    The events of each file must already be sorted by timestamp, as CoMPASS writes them.
+
+    Parameters
+    ----------
+    files : dict[int, str]
+        Path of the root file of each channel
+    tree : str
+        Key for the TTree inside the root files
+    step_size : int | str, optional
+        Size of the batches read from each file, either a number of entries or a memory size like `"100 MB"`, by default `None` which uses `root_reader_v2.default_step_size`
+    """
+    source_key = "Source" #Column holding the channel (key of `files`) of each event.
+
+    def __init__(self, files: dict[int, str], tree: str, step_size: int | str = None):
+        self.files = dict(files)
+        self.tree = tree
+        self.step_size = step_size
+
+    def get_readers(self) -> dict[int, root_reader_v2]:
+        """Creates the reader of each channel."""
+        return {channel: root_reader_v2(file_path, self.tree, self.step_size) for channel, file_path in self.files.items()}
+
+    def iterate(self, raw=False, psd=True, keys: list[str] = None) -> typing.Iterator[pandas.DataFrame]:
+        """Streams the events of all the channels in time order.
+
+        Parameters
+        ----------
+        raw : bool, optional
+            Whether we downcast the timestamps to integers or keep them as unsigned integers, by default False
+        psd : bool, optional
+            Whether we calculate the PSD values, by default True
+        keys : list[str], optional
+            Branches to read, `"PSD"` included (replaces `psd`), by default `None` which reads all the `branches`. `"Timestamp"` is always read.
+
+        Yields
+        ------
+        batch : pandas.DataFrame
+            Events sorted by timestamp, formatted like the output of `root_reader_v2.open` with the channel of each event in the `source_key` column.
+        """
+        if keys is not None and "Timestamp" not in keys:
+            keys = ["Timestamp"] + list(keys)
+        batches = {channel: reader.iterate(raw=True, psd=psd, keys=keys) for channel, reader in self.get_readers().items()}
+        pending = {} #Events read but not yielded yet, for each channel.
+        heap = [] #(Last timestamp of the pending events, channel) of the channels that still have batches to read.
+        for channel in batches:
+            self._read_next(channel, batches, pending, heap)
+
+        while heap:
+            limit = heap[0][0]
+            batch = self._take(pending, limit)
+            while heap and heap[0][0] <= limit: #These channels have given all their pending events.
+                self._read_next(heapq.heappop(heap)[1], batches, pending, heap)
+            if len(batch) > 0:
+                yield self._format(batch, raw)
+
+        batch = self._take(pending) #Only the last events of the channels remain.
+        if len(batch) > 0:
+            yield self._format(batch, raw)
+
+    def _read_next(self, channel: int, batches: dict[int, typing.Iterator[pandas.DataFrame]], pending: dict[int, pandas.DataFrame], heap: list[tuple[int, int]]):
+        batch = next(batches[channel], None)
+        if batch is None:
+            return
+        batch[self.source_key] = channel
+        pending[channel] = batch if channel not in pending else pandas.concat([pending[channel], batch], ignore_index=True)
+        heapq.heappush(heap, (int(batch["Timestamp"].iat[-1]), channel))
+
+    def _take(self, pending: dict[int, pandas.DataFrame], limit: int = None) -> pandas.DataFrame:
+        """Removes the pending events up to `limit` (all of them if `None`) and merges them in time order."""
+        taken = []
+        for channel in list(pending):
+            batch = pending[channel]
+            end = len(batch) if limit is None else int(numpy.searchsorted(batch["Timestamp"].to_numpy(), numpy.uint64(limit), side="right"))
+            if end == 0:
+                continue
+            taken.append(batch.iloc[:end])
+            if end == len(batch):
+                del pending[channel]
+            else:
+                pending[channel] = batch.iloc[end:].reset_index(drop=True)
+
+        if len(taken) == 0:
+            return pandas.DataFrame()
+        merged = pandas.concat(taken, ignore_index=True)
+        order = numpy.argsort(merged["Timestamp"].to_numpy(), kind="stable")
+        return merged.take(order).reset_index(drop=True)
+
+    @staticmethod
+    def _format(batch: pandas.DataFrame, raw: bool) -> pandas.DataFrame:
+        if not raw:
+            batch["Timestamp"] = pandas.to_numeric(batch["Timestamp"], downcast="integer")
+        return batch
+
+    def iterate_groups(self, window: int, raw=False, psd=True, keys: list[str] = None) -> typing.Iterator[pandas.DataFrame]:
+        """Streams the events of all the channels in time order with their coincidence group. An event that comes at most `window` after the previous event joins its group, and a group is never split between two batches.
+
+        Parameters
+        ----------
+        window : int
+            Maximum time (ps) between two consecutive events of a group
+        raw : bool, optional
+            Whether we downcast the timestamps to integers or keep them as unsigned integers, by default False
+        psd : bool, optional
+            Whether we calculate the PSD values, by default True
+        keys : list[str], optional
+            Branches to read, `"PSD"` included (replaces `psd`), by default `None` which reads all the `branches`. `"Timestamp"` is always read.
+
+        Yields
+        ------
+        batch : pandas.DataFrame
+            Events sorted by timestamp like `iterate`, with their group number in the `"Group"` column.
+        """
+        carried = None #Last group of the previous batch, which can continue in the next one.
+        first_group = 0
+        for batch in self.iterate(True, psd, keys):
+            if carried is not None:
+                batch = pandas.concat([carried, batch], ignore_index=True)
+            timestamps = batch["Timestamp"].to_numpy()
+            groups = numpy.full(len(batch), first_group, dtype=numpy.int64)
+            if len(batch) > 1:
+                groups[1:] += numpy.cumsum(numpy.diff(timestamps) > numpy.uint64(window))
+            batch["Group"] = groups
+            last_start = int(numpy.searchsorted(groups, groups[-1]))
+            carried, batch = batch.iloc[last_start:].drop(columns="Group").reset_index(drop=True), batch.iloc[:last_start]
+            first_group = int(groups[-1])
+            if len(batch) > 0:
+                yield self._format(batch.reset_index(drop=True), raw)
+
+        if carried is not None and len(carried) > 0:
+            carried["Group"] = first_group
+            yield self._format(carried, raw)
+
 class RootPlotter(_root_reader):
     """
     Used to produce plots containing the data from `.root` file.
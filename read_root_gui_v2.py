@@ -249,12 +249,18 @@ class GUIv2():
         Forces the GUI into its dark mode or light mode (if `False`), by default `None` and will be fetched to match the user's default theme.
     compress : bool, optional
         Chooses the compression type of the `.csv` files saved by the GUI, by default `True` which turns on `bz2` compression.
+    binary : bool, optional
+        Saves the TOF data in binary `.npy` files instead of `.csv` files, by default `True`
+    line_memory : float, optional
+        Memory (in MB) the raw data of the plotted lines can use before the oldest is moved to the disk, by default `None` which uses `QtClasses.LineStore.default_max_bytes`
     """
-    def __init__(self, name="GUIv2", window_size=[1000,500], show: bool = True, block: bool = False, ratio: float = None, full_screen: bool = True, dark_theme: bool = None, compress: bool = True):
+    def __init__(self, name="GUIv2", window_size=[1000,500], show: bool = True, block: bool = False, ratio: float = None, full_screen: bool = True, dark_theme: bool = None, compress: bool = True, binary: bool = True, line_memory: float = None):
         os.chdir(os.path.dirname(os.path.abspath(__file__)))
         self.ratio = self.get_scale_factor() if ratio is None else ratio #This is used to scale the GUI on different screen resolutions. Note that this will only work on Windows.
         self.dark_theme_on = dd.isDark() if dark_theme is None else dark_theme
         Converter.compress = compress
+        Converter.binary = binary
+        self.line_memory = line_memory
         self.colormap = pg.colormap.getFromMatplotlib("black_turbo") if self.dark_theme_on else pg.colormap.getFromMatplotlib("white_turbo")
         self.margins = int(10/3*self.ratio)
         width, height = self.get_screen_resolution()
@@ -293,7 +299,11 @@ class GUIv2():
         self.brushes = {}
         self.graph_info = {}
         self.previous_line = None
-        self.data = {}
+        self.data = QtClasses.LineStore(None if self.line_memory is None else int(self.line_memory*1024**2))
+        self.histograms = {}
+        self.plot_jobs = QtClasses.PlotJobs()
+        self.plot_jobs.running.connect(self.show_running_jobs)
+        self.plot_jobs.failed.connect(lambda error: self.logs.add_log(f"Couldn't compute the histogram: {error}"))
 
         #Generate the top grid
         self.generate_top_grid()
@@ -720,6 +730,7 @@ class GUIv2():
         self.plot_settings_dict.add_parameter("Histogram/Fill Level", value=0)
         self.plot_settings_dict.add_parameter("Histogram/Minimum bin", value=0, tip="For TOF and Time histograms")
         self.plot_settings_dict.add_parameter("Histogram/Maximum bin", value=100, tip="For TOF and time histograms")
+        self.plot_settings_dict.add_parameter("Histogram/Keep raw data", value=False, tip="Keeps the events of the plotted histograms so they can be redrawn with any bins (uses more memory)")
 
         parent.addWidget(collapsible_grid_layout._widget)
         parent.expand()
@@ -886,12 +897,12 @@ class GUIv2():
         parent.addWidget(collapse_grid_layout._widget)
 
     def reload_csv_files(self):
-        """Reloads the `.csv` files shown in the TOF options's Selecter"""
+        """Reloads the `.npy` and `.csv` files shown in the TOF options's Selecter"""
         self.selection.clear()
         if os.path.isdir(os.path.join(self.complete_path,"TOF Data")):
             items_to_add = list(os.listdir(os.path.join(self.complete_path,"TOF Data")))
             for item in items_to_add:
-                if item.endswith(".csv"):
+                if item.endswith(".npy") or item.endswith(".csv"):
                     split_item = item.split("_")[1:]
                     to_add = "_".join(split_item)
                     self.selection.add_item(to_add)
@@ -1022,8 +1033,8 @@ class GUIv2():
         self.reload_channels()
         self.changing_tree()
        
-    def load_channel_settings(self, xml_obj, combo_box: g.ComboBox, tree_dict: g.TreeDictionary, key: str, *a):
-        """Load the data for a specified channel and setting group."""
+    def load_channel_settings(self, board_parameters: dict, channel_parameters: dict, combo_box: g.ComboBox, tree_dict: g.TreeDictionary, key: str, *a):
+        """Load the data for a specified channel and setting group from the board parameters and the table of channel parameters of the `XMLParser`."""
         xml_key = key
         if key == "ENERGY CALIBRATION":
             xml_key = "ENERGY_CALIBRATION"
@@ -1032,10 +1043,10 @@ class GUIv2():
         if key == "SPECTRA":
             tree_dict_keys = tree_dict.keys()
             if combo_box.get_text() == "BOARD":
-                information = xml_obj.get_parameters()
+                information = board_parameters
             elif combo_box.get_text().startswith("CH"):
                 number = int(combo_box.get_text()[-1])
-                information = xml_obj.get_chn_parameters(number)
+                information = channel_parameters[number]
             
             for param in tree_dict_keys:
                 if parameters_types[key][param] == "str":
@@ -1046,10 +1057,10 @@ class GUIv2():
         
         tree_dict_keys = tree_dict.keys()
         if combo_box.get_text() == "BOARD":
-            information = xml_obj.get_parameters()
+            information = board_parameters
         elif combo_box.get_text().startswith("CH"):
             number = int(combo_box.get_text()[-1])
-            information = xml_obj.get_chn_parameters(number)
+            information = channel_parameters[number]
         
         for param in tree_dict_keys:
             tree_dict[param] = information[xml_key][parameters_xml_aliases[key][param]]
@@ -1057,17 +1068,23 @@ class GUIv2():
     def reload_channels(self, *a):
         """Reloads the data shown in the CoMPASS settings if the channel selected is changed."""
         if hasattr(self, "xml_parser"):
-            self.load_channel_settings(self.xml_parser, self.input_channel, self.input_dict, "INPUT")
-            self.load_channel_settings(self.xml_parser, self.disc_channel, self.disc_dict, "DISCRIMINATOR")
-            self.load_channel_settings(self.xml_parser, self.qdc_channel, self.qdc_dict, "QDC")
-            self.load_channel_settings(self.xml_parser, self.spectra_channel, self.spectra_dict, "SPECTRA")
-            self.load_channel_settings(self.xml_parser, self.reject_channel, self.reject_dict, "REJECTIONS")
-            self.load_channel_settings(self.xml_parser, self.energy_channel, self.energy_dict, "ENERGY CALIBRATION")
-            self.load_channel_settings(self.xml_parser, self.sync_channel, self.sync_dict, "SYNC")
-            self.load_channel_settings(self.xml_parser, self.misc_channel, self.misc_dict, "MISC")
+            board_parameters = self.xml_parser.get_parameters()
+            channel_parameters = self.xml_parser.get_parameter_table()
+            self.load_channel_settings(board_parameters, channel_parameters, self.input_channel, self.input_dict, "INPUT")
+            self.load_channel_settings(board_parameters, channel_parameters, self.disc_channel, self.disc_dict, "DISCRIMINATOR")
+            self.load_channel_settings(board_parameters, channel_parameters, self.qdc_channel, self.qdc_dict, "QDC")
+            self.load_channel_settings(board_parameters, channel_parameters, self.spectra_channel, self.spectra_dict, "SPECTRA")
+            self.load_channel_settings(board_parameters, channel_parameters, self.reject_channel, self.reject_dict, "REJECTIONS")
+            self.load_channel_settings(board_parameters, channel_parameters, self.energy_channel, self.energy_dict, "ENERGY CALIBRATION")
+            self.load_channel_settings(board_parameters, channel_parameters, self.sync_channel, self.sync_dict, "SYNC")
+            self.load_channel_settings(board_parameters, channel_parameters, self.misc_channel, self.misc_dict, "MISC")
 
     def changing_tree(self, *a):
         """Reloads the `.root` files inside of the project folder."""
+        if getattr(self, "worker", None) is not None:
+            self.worker.cancel() #The running scan is checking the files of the previous tree.
+        if getattr(self, "plot_jobs", None) is not None:
+            self.plot_jobs.cancel() #The histograms being computed come from the previous tree.
         folder_to_look_in = self.complete_path + "\\" + self.root_dict["ROOT Types/Type chosen"]
         self.files = [file for file in os.listdir(folder_to_look_in) if file.endswith(".root")]
         match self.root_dict["ROOT Types/Type chosen"]:
@@ -1291,18 +1308,12 @@ class GUIv2():
         #Get the data for the line:
         if style != "2D-HIST":
             x_data, y_data = self.lines[line_selected].getData()
-            raw_data = self.data[line_selected]
-        else:
-            raw_data = self.data[line_selected]
+        raw_data = self.data[line_selected]
+        histogram = self.histograms[line_selected]
 
-        
 
         #Remove the line:
-        self.plot.removeItem(self.lines[line_selected])
-        self.lines.pop(line_selected)
-        self.pens.pop(line_selected)
-        self.brushes.pop(line_selected)
-        self.graph_info.pop(line_selected)
+        self.remove_line(line_selected)
         line_index = self.line_selector.get_index(line_selected)
         self.line_selector.remove_item(line_index)
 
@@ -1316,15 +1327,25 @@ class GUIv2():
         #Plot the line again:
         if style == "2D-HIST":
             y_bins = self.plot_settings_dict["Histogram/Y Axis bins"]
+            density, x_edges, y_edges = histogram
             x_range = None
             y_range = None
             if type_ in ranged_2dhist:
                 y_range = self.get_bin_range(type_.split("vs")[0])
-                min_e = min(raw_data[0])
-                max_e = max(raw_data[0])
-                x_range = (min_e, max_e)
+                x_range = (x_edges[0], x_edges[-1])
 
-            density = np.histogram2d(*raw_data, bins=[bins, y_bins], range=(x_range, y_range))[0]
+            if raw_data is not None:
+                density, x_edges, y_edges = np.histogram2d(*raw_data, bins=[bins, y_bins], range=(x_range, y_range))
+            elif y_range is not None and not np.allclose(y_range, (y_edges[0], y_edges[-1])):
+                self.logs.add_log("Turn on `Keep raw data` to change the range of a 2D histogram.")
+            else:
+                rebinned_density = read_root.rebin_counts(density, (bins, y_bins)) #Exact and doesn't need the raw data.
+                if rebinned_density is None:
+                    self.logs.add_log(f"Can't rebin {density.shape[0]}x{density.shape[1]} bins into {bins}x{y_bins}, turn on `Keep raw data` to use any number of bins.")
+                else:
+                    x_edges = x_edges[::(len(x_edges)-1)//bins]
+                    y_edges = y_edges[::(len(y_edges)-1)//y_bins]
+                    density = rebinned_density
 
             transform = QtGui.QTransform()
             transform.scale(1,1)
@@ -1381,6 +1402,7 @@ class GUIv2():
             self.brushes[name] = brush_data
             self.graph_info[name] = {"style":style,"fill":None,"type":type_}
             self.data[name] = raw_data
+            self.histograms[name] = (density, x_edges, y_edges)
             self.clean_up()
             return
 
@@ -1389,7 +1411,12 @@ class GUIv2():
             if type_ in ranged_hist:
                 bin_range = self.get_bin_range(type_)
 
-            hist = np.histogram(raw_data, bins=bins, range=bin_range)
+            hist = histogram.rebin(bins, bin_range) #Exact and doesn't need the raw data.
+            if hist is None and raw_data is not None:
+                hist = read_root.histogram(raw_data, bins, bin_range)
+            if hist is None:
+                self.logs.add_log(f"Can't rebin the histogram into {bins} bins, turn on `Keep raw data` to use any number of bins.")
+                hist = (y_data, x_data)
             x = hist[1]
             y = hist[0]
             line = self.plot.plot(x, y, stepMode="center", fillLevel=self.plot_settings_dict["Histogram/Fill Level"], brush=brush, pen=pen, name=name)
@@ -1404,6 +1431,8 @@ class GUIv2():
         self.lines[name] = line
         self.pens[name] = pen_data
         self.brushes[name] = brush_data
+        self.data[name] = raw_data
+        self.histograms[name] = histogram
 
         self.line_selector.add_item(name)
         index = self.line_selector.get_index(name)
@@ -1413,13 +1442,7 @@ class GUIv2():
     def delete(self, *a):
         """Deletes the selected line/image"""
         line_selected = self.line_selector.get_text()
-        self.plot.removeItem(self.lines[line_selected])
-        # self.plot.legend.removeItem(self.lines[line_selected])
-        self.lines.pop(line_selected)
-        self.pens.pop(line_selected)
-        self.brushes.pop(line_selected)
-        self.graph_info.pop(line_selected)
-        self.data.pop(line_selected)
+        self.remove_line(line_selected)
         
         plotted_items_names = self.lines.keys()
         self.line_selector.block_signals()
@@ -1428,6 +1451,15 @@ class GUIv2():
         self.line_selector.unblock_signals()
 
 
+    def remove_line(self, name: str):
+        """Removes a line/image from the plot with its pen, brush, information, raw data and histogram so that nothing keeps its arrays (or their spill files) alive."""
+        self.plot.removeItem(self.lines.pop(name))
+        self.pens.pop(name, None)
+        self.brushes.pop(name, None)
+        self.graph_info.pop(name, None)
+        self.data.pop(name)
+        self.histograms.pop(name, None)
+
     def save_snapshot(self, *a):
         """Saves a screenshot of the graph inside of the screenshots folder generated by CoMPASS"""
         exporter = export.ImageExporter(self.plot)
@@ -1436,12 +1468,15 @@ class GUIv2():
         exporter.export(path_to_save)
 
     def clear(self, *a):
-        """Clears the plot zone"""
+        """Clears the plot zone, drops the histograms that are still being computed and frees the data of the lines."""
+        self.plot_jobs.cancel()
         self.plot.clear()
         self.lines.clear()
         self.pens.clear()
         self.brushes.clear()
         self.graph_info.clear()
+        self.data.clear() #Also deletes the spill files.
+        self.histograms.clear()
         self.line_selector.clear()
         self.clear_btn.set_checked(False)
         self.roi_btn.set_checked(False)
@@ -1461,7 +1496,7 @@ class GUIv2():
         Parameters
         ----------
         data : tuple
-            X bins, Y bins and raw histogram data
+            X bins, Y bins, raw histogram data, fine histogram and limits of the data, given by `prepare_plot_data`
         type_ : str
             Type of histogram (depending on the type some histogram ranges might change)
         button : str
@@ -1473,12 +1508,7 @@ class GUIv2():
         step = "center"
         
         #Set the data in the databox
-        x, y, root_data = data
-        min_value = min(root_data)
-        max_value = max(root_data)
-        if button == "PSD":
-            min_value = 0
-            max_value = 1
+        x, y, root_data, histogram, (min_value, max_value) = data
 
         if "No lines for now." in self.line_selector.get_all_items():
             pen = pg.mkPen(pen_data)
@@ -1508,7 +1538,8 @@ class GUIv2():
         self.pens[line.name()] = pen_data
         self.brushes[line.name()] = brush_data
         self.graph_info[line.name()] = {"style":type_,"fill":fill_level,"type":button}
-        self.data[line.name()] = root_data
+        self.histograms[line.name()] = histogram
+        self.data[line.name()] = root_data if self.plot_settings_dict["Histogram/Keep raw data"] else None
 
         self.change_bin_number(min_value, max_value)
 
@@ -1587,7 +1618,8 @@ class GUIv2():
         self.pens[name] = pen_data
         self.brushes[name] = brush_data
         self.graph_info[name] = {"style":type_,"fill":fill_level,"type":button}
-        self.data[name] = original_data
+        self.histograms[name] = (density_data, x, y)
+        self.data[name] = original_data if self.plot_settings_dict["Histogram/Keep raw data"] else None
             
         
     def enable_buttons(self, buttons_list):
@@ -1636,18 +1668,15 @@ class GUIv2():
             self.root_dict.disable()
 
             if button == "TOF":
-                data = root_reader(start_file, self.tree).get_tof_hist(stop_file, self.plot_settings_dict["Histogram/Minimum bin"], self.plot_settings_dict["Histogram/Maximum bin"], self.plot_settings_dict["Histogram/X Axis bins"])
-                self.plot_data(data, "HIST", button) if data is not None else None
+                self.compute_plot_data(root_reader(start_file, self.tree).get_tof_hist, "HIST", button, stop_file, self.plot_settings_dict["Histogram/Minimum bin"], self.plot_settings_dict["Histogram/Maximum bin"], self.plot_settings_dict["Histogram/X Axis bins"])
                 self.tof_btn.set_checked(False)
 
             if button == "EvsE":
-                data = root_reader(start_file, self.tree).get_evse_hist(stop_file, self.plot_settings_dict["Histogram/X Axis bins"],self.plot_settings_dict["Histogram/Y Axis bins"])
-                self.plot_2dhist(data, button) if data is not None else None
+                self.compute_in_background(root_reader(start_file, self.tree).get_evse_hist, lambda data: self.plot_2dhist(data, button), stop_file, self.plot_settings_dict["Histogram/X Axis bins"],self.plot_settings_dict["Histogram/Y Axis bins"])
                 self.evse_btn.set_checked(False)
 
             if button == "TOFvsE":
-                data = root_reader(start_file, self.tree).get_tofvse_hist(stop_file, self.plot_settings_dict["Histogram/Minimum bin"],self.plot_settings_dict["Histogram/Maximum bin"],self.plot_settings_dict["Histogram/X Axis bins"],self.plot_settings_dict["Histogram/Y Axis bins"])
-                self.plot_2dhist(data, button) if data is not None else None
+                self.compute_in_background(root_reader(start_file, self.tree).get_tofvse_hist, lambda data: self.plot_2dhist(data, button), stop_file, self.plot_settings_dict["Histogram/Minimum bin"],self.plot_settings_dict["Histogram/Maximum bin"],self.plot_settings_dict["Histogram/X Axis bins"],self.plot_settings_dict["Histogram/Y Axis bins"])
                 self.tofvse_btn.set_checked(False)
             
             self.clean_up()
@@ -1660,6 +1689,7 @@ class GUIv2():
                 start_string = f"{starts[0]}-{starts[1]}"
                 stop_string = f"{stops[0]}-{stops[1]}"
                 self.csv_name = read_root.generate_csv_name(start_file, start_btn, stop_btn, time_window_quantity, True, (start_string, stop_string))
+            self.csv_name = Converter.output_path(self.csv_name)
                 
             
             self.root_dict.disable()
@@ -1681,15 +1711,15 @@ class GUIv2():
             self.merger.finished.connect(self.merger.deleteLater)
             
             if button == "TOF":
-                self.merger.finished.connect(lambda: self.plot_data(read_root.get_cpp_tof_hist(self.csv_name, self.plot_settings_dict["Histogram/Minimum bin"], self.plot_settings_dict["Histogram/Maximum bin"], self.plot_settings_dict["Histogram/X Axis bins"],compress=Converter.compress), "HIST", "TOF"))
+                self.merger.finished.connect(lambda: self.compute_plot_data(read_root.get_cpp_tof_hist, "HIST", "TOF", self.csv_name, self.plot_settings_dict["Histogram/Minimum bin"], self.plot_settings_dict["Histogram/Maximum bin"], self.plot_settings_dict["Histogram/X Axis bins"],compress=Converter.compress))
                 self.merger.finished.connect(lambda: self.tof_btn.set_checked(False))
             
             if button == "EvsE":
-                self.merger.finished.connect(lambda: self.plot_2dhist(read_root.get_cpp_evse_hist(self.csv_name, self.plot_settings_dict["Histogram/X Axis bins"], self.plot_settings_dict["Histogram/Y Axis bins"],compress=Converter.compress), button))
+                self.merger.finished.connect(lambda: self.compute_in_background(read_root.get_cpp_evse_hist, lambda data: self.plot_2dhist(data, button), self.csv_name, self.plot_settings_dict["Histogram/X Axis bins"], self.plot_settings_dict["Histogram/Y Axis bins"],compress=Converter.compress))
                 self.merger.finished.connect(lambda: self.evse_btn.set_checked(False))
             
             if button == "TOFvsE":
-                self.merger.finished.connect(lambda: self.plot_2dhist(read_root.get_cpp_tofvse_hist(self.csv_name, self.plot_settings_dict["Histogram/Minimum bin"], self.plot_settings_dict["Histogram/Maximum bin"], self.plot_settings_dict["Histogram/X Axis bins"], self.plot_settings_dict["Histogram/Y Axis bins"],compress=Converter.compress), button))
+                self.merger.finished.connect(lambda: self.compute_in_background(read_root.get_cpp_tofvse_hist, lambda data: self.plot_2dhist(data, button), self.csv_name, self.plot_settings_dict["Histogram/Minimum bin"], self.plot_settings_dict["Histogram/Maximum bin"], self.plot_settings_dict["Histogram/X Axis bins"], self.plot_settings_dict["Histogram/Y Axis bins"],compress=Converter.compress))
                 self.merger.finished.connect(lambda: self.tofvse_btn.set_checked(False))
             
             self.merger.finished.connect(self.clean_up)
@@ -1707,15 +1737,15 @@ class GUIv2():
             self.selection.disable()
 
             if button == "TOF":
-                self.plot_data(read_root.get_cpp_tof_hist(csv_to_use, self.plot_settings_dict["Histogram/Minimum bin"], self.plot_settings_dict["Histogram/Maximum bin"], self.plot_settings_dict["Histogram/X Axis bins"],compress=Converter.compress), "HIST", "TOF")
+                self.compute_plot_data(read_root.get_cpp_tof_hist, "HIST", "TOF", csv_to_use, self.plot_settings_dict["Histogram/Minimum bin"], self.plot_settings_dict["Histogram/Maximum bin"], self.plot_settings_dict["Histogram/X Axis bins"],compress=Converter.compress)
                 self.tof_btn.set_checked(False)
 
             if button == "EvsE":
-                self.plot_2dhist(read_root.get_cpp_evse_hist(csv_to_use, self.plot_settings_dict["Histogram/X Axis bins"], self.plot_settings_dict["Histogram/Y Axis bins"],compress=Converter.compress), button)
+                self.compute_in_background(read_root.get_cpp_evse_hist, lambda data: self.plot_2dhist(data, button), csv_to_use, self.plot_settings_dict["Histogram/X Axis bins"], self.plot_settings_dict["Histogram/Y Axis bins"],compress=Converter.compress)
                 self.evse_btn.set_checked(False)
 
             if button == "TOFvsE":
-                self.plot_2dhist(read_root.get_cpp_tofvse_hist(csv_to_use, self.plot_settings_dict["Histogram/Minimum bin"], self.plot_settings_dict["Histogram/Maximum bin"], self.plot_settings_dict["Histogram/X Axis bins"], self.plot_settings_dict["Histogram/Y Axis bins"],compress=Converter.compress), button)
+                self.compute_in_background(read_root.get_cpp_tofvse_hist, lambda data: self.plot_2dhist(data, button), csv_to_use, self.plot_settings_dict["Histogram/Minimum bin"], self.plot_settings_dict["Histogram/Maximum bin"], self.plot_settings_dict["Histogram/X Axis bins"], self.plot_settings_dict["Histogram/Y Axis bins"],compress=Converter.compress)
                 self.tofvse_btn.set_checked(False)
 
             self.clean_up()
@@ -1748,6 +1778,60 @@ class GUIv2():
 
         
 
+    def compute_in_background(self, function, plot, *args, **kwargs):
+        """Computes the data of a plot on the plot jobs' threads and plots it once it's ready. The line keeps the name it had when it was requested."""
+        name = self.plot_settings_dict["Line/Name"]
+        def plot_result(data):
+            self.plot_settings_dict["Line/Name"] = name
+            if data is not None:
+                plot(data)
+            self.clean_up()
+        self.plot_jobs.submit(function, plot_result, *args, **kwargs)
+
+    def compute_plot_data(self, function, type_: str, button: str, *args, **kwargs):
+        """Computes the data of a 1D plot and everything `plot_data` needs from the raw data on the plot jobs' threads, then plots it."""
+        self.compute_in_background(lambda *args, **kwargs: self.prepare_plot_data(function(*args, **kwargs), type_, button), lambda data: self.plot_data(data, type_, button), *args, **kwargs)
+
+    @staticmethod
+    def prepare_plot_data(data: tuple, type_: str, button: str) -> tuple | None:
+        """Adds the fine histogram and the limits of the raw data to the data of a 1D plot. Runs on the plot jobs' threads since both go over every event.
+
+        Parameters
+        ----------
+        data : tuple
+            X bins, Y bins and raw histogram data
+        type_ : str
+            Type of histogram
+        button : str
+            Button pressed for the histogram.
+
+        Returns
+        -------
+        data : tuple | None
+            X bins, Y bins, raw histogram data, fine histogram and limits of the data, `None` if there is no data.
+        """
+        if data is None:
+            return
+        x, y, root_data = data
+        if button == "PSD":
+            limits = (0, 1)
+        elif root_data is not None:
+            limits = (root_data.min(), root_data.max())
+        else:
+            limits = (x[0], x[-1])
+        if type_ == "HIST" and root_data is not None:
+            histogram = read_root.FineHistogram.from_data(root_data, len(y), (x[0], x[-1]))
+        else:
+            histogram = read_root.FineHistogram(y, x)
+        return (x, y, root_data, histogram, limits)
+
+    def show_running_jobs(self, running: int):
+        """Shows a busy cursor while histograms are computed."""
+        if running and QtWidgets.QApplication.overrideCursor() is None:
+            QtWidgets.QApplication.setOverrideCursor(QtCore.Qt.BusyCursor)
+        elif not running and QtWidgets.QApplication.overrideCursor() is not None:
+            QtWidgets.QApplication.restoreOverrideCursor()
+
     def plot_graphs(self, *a):
         """Plots the graph corresponding to the selected button"""
         btn_checked = self.what_btn_is_checked(self.buttons_list)
@@ -1760,9 +1844,8 @@ class GUIv2():
             self.plot_settings_dict["Axis/X Label"] = "Energy bins"
             self.plot_settings_dict["Axis/Y Label"] = "Counts"
             
-            data = root_reader(path_to_use, self.tree).get_energy_hist(bins=self.plot_settings_dict["Histogram/X Axis bins"])
+            self.compute_plot_data(root_reader(path_to_use, self.tree).get_energy_hist, "HIST", "ENERGY", bins=self.plot_settings_dict["Histogram/X Axis bins"])
 
-            self.plot_data(data, "HIST","ENERGY")
             self.energy_btn.set_checked(False)
             self.clean_up()
 
@@ -1771,9 +1854,8 @@ class GUIv2():
             self.plot_settings_dict["Axis/X Label"] = "PSD bins"
             self.plot_settings_dict["Axis/Y Label"] = "Counts"
 
-            data = root_reader(path_to_use, self.tree).get_psd_hist(bins=self.plot_settings_dict["Histogram/X Axis bins"])
+            self.compute_plot_data(root_reader(path_to_use, self.tree).get_psd_hist, "HIST", "PSD", bins=self.plot_settings_dict["Histogram/X Axis bins"])
             
-            self.plot_data(data, "HIST","PSD")
             self.psd_btn.set_checked(False)
             self.clean_up()
 
@@ -1782,9 +1864,8 @@ class GUIv2():
             self.plot_settings_dict["Axis/X Label"] = "Time bins"
             self.plot_settings_dict["Axis/Y Label"] = "Counts"
 
-            data = root_reader(path_to_use, self.tree).get_time_hist(self.plot_settings_dict["Histogram/Minimum bin"], self.plot_settings_dict["Histogram/Maximum bin"], bins=self.plot_settings_dict["Histogram/X Axis bins"])
+            self.compute_plot_data(root_reader(path_to_use, self.tree).get_time_hist, "HIST", "TIME", self.plot_settings_dict["Histogram/Minimum bin"], self.plot_settings_dict["Histogram/Maximum bin"], bins=self.plot_settings_dict["Histogram/X Axis bins"])
 
-            self.plot_data(data, "HIST","TIME")
             self.time_btn.set_checked(False)
             self.clean_up()
 
@@ -1800,9 +1881,8 @@ class GUIv2():
             self.plot_settings_dict["Axis/X Label"] = "Energy bins"
             self.plot_settings_dict["Axis/Y Label"] = "PSD bins"            
             
-            data = root_reader(path_to_use, self.tree).get_psdvse_hist(self.plot_settings_dict["Histogram/X Axis bins"],self.plot_settings_dict["Histogram/Y Axis bins"])
+            self.compute_in_background(root_reader(path_to_use, self.tree).get_psdvse_hist, lambda data: self.plot_2dhist(data, "PSDvsE"), self.plot_settings_dict["Histogram/X Axis bins"],self.plot_settings_dict["Histogram/Y Axis bins"])
 
-            self.plot_2dhist(data, "PSDvsE")
             self.psdvse_btn.set_checked(False)
             self.clean_up()
 
@@ -1825,9 +1905,8 @@ class GUIv2():
             self.plot_settings_dict["Axis/X Label"] = "Time"
             self.plot_settings_dict["Axis/Y Label"] = "Events"
 
-            data = root_reader(path_to_use, self.tree).get_mcs_graph()
+            self.compute_plot_data(root_reader(path_to_use, self.tree).get_mcs_graph, "GRAPH", "MCS")
 
-            self.plot_data(data, "GRAPH","MCS")
             self.mcs_btn.set_checked(False)
             self.clean_up()
 
@@ -1858,8 +1937,9 @@ class GUIv2():
             self.worker.finished.connect(self.worker.deleteLater)
             self.worker.progress.connect(self.update_states)
 
+            worker = self.worker
+            self.worker.finished.connect(lambda: None if worker.cancelled else self.disable_all_buttons(self.states))
             self.check_thread.start()
-            self.worker.finished.connect(lambda: self.disable_all_buttons(self.states))
             self.load_states = False
 
         if not hasattr(self, "load_states") and a[0]:
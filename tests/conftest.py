@@ -0,0 +1,9 @@
+import importlib.util, os, sys
+
+#The repository is the ReadROOT package itself (see `package_dir` in setup.py), so it is loaded under that name for the tests.
+root = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+if "ReadROOT" not in sys.modules:
+    spec = importlib.util.spec_from_file_location("ReadROOT", os.path.join(root, "__init__.py"), submodule_search_locations=[root])
+    module = importlib.util.module_from_spec(spec)
+    sys.modules["ReadROOT"] = module
+    spec.loader.exec_module(module)
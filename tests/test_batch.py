@@ -0,0 +1,21 @@
+import numpy as np
+import uproot
+
+from ReadROOT import batch
+
+def test_short_run_keeps_the_other_histograms(tmp_path):
+    folder = tmp_path / "run" / "RAW"
+    folder.mkdir(parents=True)
+    rng = np.random.default_rng(0)
+    timestamps = np.sort(rng.integers(0, 10**11, 1000)).astype(np.uint64) #0.1 s, too short for the 1 s bins of the MCS graph.
+    with uproot.recreate(folder / "DataR_CH0@test.root") as f:
+        f["Data_R"] = {"Channel": np.zeros(1000, np.uint16), "Timestamp": timestamps, "Board": np.zeros(1000, np.uint16), "Energy": rng.integers(1, 4096, 1000).astype(np.uint16), "EnergyShort": rng.integers(1, 4096, 1000).astype(np.uint16), "Flags": np.zeros(1000, np.uint32)}
+
+    settings = vars(batch.parse_arguments([str(tmp_path / "run"), "--bins", "64", "--time-range", "0", "1"]))
+    jobs = batch.find_jobs([str(tmp_path / "run")], ["RAW"], [])
+    output_path, skipped = batch.run_job(jobs[0], settings)
+
+    assert len(skipped) == 1 and skipped[0].startswith("mcs")
+    with np.load(output_path) as arrays:
+        assert sorted(arrays.keys()) == ["energy_counts", "energy_edges", "psd_counts", "psd_edges", "time_counts", "time_edges"]
+        assert arrays["energy_counts"].sum() == 1000
@@ -0,0 +1,47 @@
+import numpy as np
+import pytest
+
+from ReadROOT.merge.merge_root_files import find_coincidences
+
+def brute_force_coincidences(stops, starts, window):
+    """Matches each start, in time order, with the first unused stop at most `window` away."""
+    used = set()
+    index0, index1 = [], []
+    for start_index, start in enumerate(starts.tolist()):
+        for stop_index, stop in enumerate(stops.tolist()):
+            if stop_index not in used and abs(stop - start) <= window:
+                used.add(stop_index)
+                index0.append(stop_index)
+                index1.append(start_index)
+                break
+    return np.array(index0, dtype=np.intp), np.array(index1, dtype=np.intp)
+
+@pytest.mark.parametrize("seed", range(5))
+@pytest.mark.parametrize("window", [0, 1, 5, 40, 1000])
+def test_find_coincidences_matches_brute_force(seed, window):
+    rng = np.random.default_rng(seed)
+    stops = np.sort(rng.integers(0, 2000, 300)).astype(np.uint64) #Small range, so there are duplicates.
+    starts = np.sort(rng.integers(0, 2000, 250)).astype(np.uint64)
+    index0, index1 = find_coincidences(stops, starts, window)
+    expected0, expected1 = brute_force_coincidences(stops, starts, window)
+    np.testing.assert_array_equal(index0, expected0)
+    np.testing.assert_array_equal(index1, expected1)
+
+@pytest.mark.parametrize("stops, starts", [([], []), ([1, 2, 3], []), ([], [1, 2, 3])])
+def test_find_coincidences_empty(stops, starts):
+    index0, index1 = find_coincidences(np.array(stops, dtype=np.uint64), np.array(starts, dtype=np.uint64), 10)
+    assert len(index0) == 0 and len(index1) == 0
+
+def test_rewritten_tof_data_is_reloaded(tmp_path):
+    from ReadROOT import read_root
+    from ReadROOT.merge.merge_root_files import Converter
+
+    def merged(energy):
+        return {"Start Time": np.arange(10, dtype=np.uint64), "Stop Time": np.arange(10, dtype=np.uint64) + np.uint64(1000), "Start Energy": np.full(10, energy, np.uint16), "Stop Energy": np.full(10, energy, np.uint16)}
+
+    file_path = Converter(merged(1)).save(str(tmp_path / "merged"))
+    dataset = read_root.TOFData.load(file_path)
+    assert not any(isinstance(array, np.memmap) or isinstance(array.base, np.memmap) for array in [dataset.start_energy, dataset.stop_energy, dataset.delta_time])
+
+    Converter(merged(2)).save(file_path) #Overwrites the file while the dataset is still cached.
+    assert read_root.TOFData.load(file_path).start_energy[0] == 2
@@ -0,0 +1,113 @@
+import os
+
+import numpy as np
+import pytest
+import uproot
+
+from ReadROOT import read_root
+
+branch_types = {"Channel": np.uint16, "Timestamp": np.uint64, "Board": np.uint16, "Energy": np.uint16, "EnergyShort": np.uint16, "Flags": np.uint32}
+
+def write_channel(path, timestamps, seed=0):
+    """Writes a CoMPASS-like file with the given timestamps (ps) and random energies."""
+    rng = np.random.default_rng(seed)
+    data = {"Channel": np.zeros(len(timestamps)), "Timestamp": timestamps, "Board": np.zeros(len(timestamps)), "Energy": rng.integers(1, 4096, len(timestamps)), "EnergyShort": rng.integers(1, 2048, len(timestamps)), "Flags": np.zeros(len(timestamps))}
+    with uproot.recreate(path) as f:
+        f.mktree("Data_R", branch_types)
+        if len(timestamps) != 0:
+            f["Data_R"].extend({key: np.asarray(values).astype(branch_types[key]) for key, values in data.items()})
+    return str(path)
+
+@pytest.mark.parametrize("values", [
+    np.array([-30000, 30000], np.int16), #Wider than the int16 range once the minimum is subtracted.
+    np.array([-100, 27, 100, -100], np.int8),
+    np.random.default_rng(0).integers(0, 4096, 10000).astype(np.uint16),
+    np.random.default_rng(1).integers(-2**19, 2**19, 10000).astype(np.int32),
+    np.random.default_rng(2).integers(0, 2**19, 10000).astype(np.uint64) + np.uint64(10**15),
+    np.random.default_rng(3).normal(0, 1, 10000),
+])
+@pytest.mark.parametrize("range_", [None, (-50, 50)])
+def test_histogram_matches_numpy(values, range_):
+    counts, edges = read_root.histogram(values, 10, range_)
+    expected_counts, expected_edges = np.histogram(values, 10, range=range_)
+    np.testing.assert_array_equal(counts, expected_counts)
+    np.testing.assert_array_equal(edges, expected_edges)
+
+def test_fine_histogram_rebin():
+    data = np.arange(100.) + 0.5
+    fine = read_root.FineHistogram.from_data(data, 10, (0, 100))
+    counts, edges = fine.rebin(5, (20.0, 70.0))
+    expected_counts, expected_edges = np.histogram(data, 5, range=(20, 70))
+    np.testing.assert_array_equal(counts, expected_counts)
+    np.testing.assert_allclose(edges, expected_edges)
+    assert fine.rebin(10, (50.0, 50.0)) is None #Empty range, the caller falls back to the raw data.
+    assert fine.rebin(10, (60.0, 50.0)) is None
+
+@pytest.mark.parametrize("step_size", [None, 100])
+def test_mcs_graph_of_empty_file(tmp_path, step_size):
+    file_path = write_channel(tmp_path / "CH0@empty.root", np.array([], np.uint64))
+    with pytest.raises(ValueError, match="doesn't contain any data"):
+        read_root.root_reader_v2(file_path, "Data_R", step_size).get_mcs_graph()
+
+@pytest.mark.parametrize("step_size", [1000, 777, "20 kB"])
+def test_streamed_energy_hist_matches_in_memory(tmp_path, step_size):
+    file_path = write_channel(tmp_path / "CH0@run.root", np.sort(np.random.default_rng(1).integers(0, 10**13, 5000)).astype(np.uint64))
+    x, y, _ = read_root.root_reader_v2(file_path, "Data_R").get_energy_hist(256)
+    streamed_x, streamed_y, raw = read_root.root_reader_v2(file_path, "Data_R", step_size).get_energy_hist(256)
+    assert raw is None
+    np.testing.assert_array_equal(streamed_y, y)
+    np.testing.assert_allclose(streamed_x, x)
+
+def test_dataset_cache_evicts_by_byte_budget():
+    cache = read_root.DatasetCache(max_bytes=2500)
+    keys = [(f"file{index}.root", "Data_R", 0, 0) for index in range(3)]
+    for key in keys[:2]:
+        cache.put(key, {"Energy": np.zeros(1000, np.uint8)})
+    assert cache.get(keys[0], ["Energy"]) is not None #The first file is now the most recently used.
+
+    cache.put(keys[2], {"Energy": np.zeros(1000, np.uint8)})
+    assert cache.nbytes == 2000
+    assert cache.get(keys[1], ["Energy"]) is None
+    assert cache.get(keys[0], ["Energy"]) is not None and cache.get(keys[2], ["Energy"]) is not None
+
+    cache.max_bytes = 1500
+    assert cache.nbytes == 1000
+    assert cache.get(keys[0], ["Energy"]) is None and cache.get(keys[2], ["Energy"]) is not None
+
+@pytest.mark.parametrize("step_size", [50, 333, "10 kB"])
+def test_event_stream_is_time_ordered(tmp_path, step_size):
+    rng = np.random.default_rng(2)
+    timestamps = {channel: np.sort(rng.integers(0, 10**6, 2000 + 500*channel)).astype(np.uint64) for channel in range(3)} #Overlapping, with duplicates.
+    files = {channel: write_channel(tmp_path / f"CH{channel}@run.root", channel_timestamps, channel) for channel, channel_timestamps in timestamps.items()}
+
+    batches = list(read_root.EventStream(files, "Data_R", step_size).iterate(raw=True, keys=["Energy"]))
+    stream = np.concatenate([batch["Timestamp"].to_numpy() for batch in batches])
+    sources = np.concatenate([batch[read_root.EventStream.source_key].to_numpy() for batch in batches])
+    assert len(batches) > 1
+    assert np.all(stream[1:] >= stream[:-1])
+    for channel, channel_timestamps in timestamps.items():
+        np.testing.assert_array_equal(stream[sources == channel], channel_timestamps)
+
+def test_sidecar_is_rebuilt_when_the_file_changes(tmp_path, monkeypatch):
+    monkeypatch.setattr(read_root.root_reader_v2, "use_cache", False)
+    monkeypatch.setattr(read_root.root_reader_v2, "use_sidecar", True)
+    timestamps = np.arange(1000, dtype=np.uint64)
+    file_path = write_channel(tmp_path / "CH0@run.root", timestamps, seed=0)
+    reader = read_root.root_reader_v2(file_path, "Data_R")
+    sidecar = reader.get_sidecar()
+
+    first = reader.read_branches(["Energy"])["Energy"].copy()
+    mapped = sidecar.load(read_root.DatasetCache.make_key(file_path, "Data_R"), ["Energy"])
+    assert isinstance(mapped["Energy"], np.memmap)
+    np.testing.assert_array_equal(reader.read_branches(["Energy"])["Energy"], first)
+
+    write_channel(file_path, timestamps, seed=1) #Same size, other energies.
+    stat = os.stat(file_path)
+    os.utime(file_path, ns=(stat.st_atime_ns, stat.st_mtime_ns + 10**9))
+    key = read_root.DatasetCache.make_key(file_path, "Data_R")
+    assert sidecar.load(key, ["Energy"]) is None #Stale, not used.
+
+    second = reader.read_branches(["Energy"])["Energy"]
+    assert not np.array_equal(second, first)
+    np.testing.assert_array_equal(sidecar.load(key, ["Energy"])["Energy"], second)
+    assert sidecar.read_info()["mtime_ns"] == key[2]